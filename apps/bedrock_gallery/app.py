@@ -38,6 +38,7 @@ def main():
         )
         cols_gallery = st.slider("갤러리 열 수 설정", min_value=1, max_value=7, value=3)
         cols_history = st.slider("히스토리 열 수 설정", min_value=1, max_value=3, value=1)
+        max_items = st.number_input("표시 개수", min_value=10, max_value=1000, value=100, step=10)
         show_details = st.checkbox("상세 정보 표시", value=False)
 
     session_manager = SessionManager()
@@ -48,27 +49,20 @@ def main():
     with video_generator_tab:
         show_video_generator(session_manager)
 
-    media_items = get_media_items(session_manager, filter_type)    
+    media_items = get_media_items(session_manager, filter_type, max_items)    
     with gallery_tab:
-        show_gallery(media_items, cols_gallery, show_details)
+        show_gallery(media_items, cols_gallery, show_details, load_item=session_manager.get_item)
 
     with history_tab:
-        show_history(media_items, cols_history, show_details)
+        show_history(media_items, cols_history, show_details, load_item=session_manager.get_item)
 
 
-def get_media_items(session_manager: SessionManager, filter_type):
-    history = session_manager.get_history()
-    if history:
-        media_items = [item for item in history 
-                          if item['media_type'] in filter_type]
-        
-        media_items = sorted(
-            media_items,
-            key=lambda x: x.get('created_at', ''),
-            reverse=True
-        )
-        return media_items
-    return []
+def get_media_items(session_manager: SessionManager, filter_type, max_items=None):
+    if not filter_type:
+        return []
+
+    # 선택된 media_type 별로 GSI 에서 최신순으로 max_items 개만, 목록용 attribute 만 조회
+    return session_manager.get_history(media_type=filter_type, limit=max_items) or []
 
 
 if __name__ == "__main__":
@@ -82,6 +82,23 @@ class CdkStack(Stack):
             removal_policy=RemovalPolicy.DESTROY
         )
 
+        # media_type 별 최신순 조회용 GSI (constants.MEDIA_TYPE_INDEX)
+        table.add_global_secondary_index(
+            index_name="media_type-created_at-index",
+            partition_key=dynamodb.Attribute(
+                name="media_type",
+                type=dynamodb.AttributeType.STRING
+            ),
+            sort_key=dynamodb.Attribute(
+                name="created_at",
+                type=dynamodb.AttributeType.STRING
+            ),
+            # 목록 조회용 thin row 만 복제 (ref_image / details 는 base table 에서 id 로 조회)
+            # apps/bedrock_gallery/constants.py 의 MEDIA_LIST_FIELDS 와 맞춰야 함
+            projection_type=dynamodb.ProjectionType.INCLUDE,
+            non_key_attributes=["model_type", "prompt", "url", "updated_at"]
+        )
+
         # 출력값 정의
         CfnOutput(self, "BucketName", value=bucket.bucket_name)
         CfnOutput(self, "CloudFrontDomainName", value=distribution.domain_name)
@@ -1,28 +1,38 @@
 import json
 import streamlit as st
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from enums import MediaType
 from utils import format_datetime
 
 
-def show_gallery(media_items: List[dict] = [], cols_per_row: int = 3, show_details: bool = False):
+def show_gallery(
+    media_items: List[dict] = [],
+    cols_per_row: int = 3,
+    show_details: bool = False,
+    load_item: Optional[Callable[[dict], dict]] = None,
+):
     st.title("🖼️ GenAI Gallery")
 
     if media_items and len(media_items) > 0:
-        display_media_grid(media_items, cols_per_row, show_details)
+        display_media_grid(media_items, cols_per_row, show_details, load_item)
     else:
         st.info("표시할 미디어가 없습니다.")
 
-def display_media_grid(media_items: List[Dict[str, Any]], cols_per_row: int, show_details: bool):
+def display_media_grid(
+    media_items: List[Dict[str, Any]],
+    cols_per_row: int,
+    show_details: bool,
+    load_item: Optional[Callable[[dict], dict]] = None,
+):
     cols = st.columns(cols_per_row)
     
     for idx, item in enumerate(media_items):
         col_idx = idx % cols_per_row
         
         with cols[col_idx]:
-            display_media_item(item, show_details)
+            display_media_item(item, show_details, load_item)
 
-def display_media_item(item: Dict[str, Any], show_details: bool):
+def display_media_item(item: Dict[str, Any], show_details: bool, load_item: Optional[Callable[[dict], dict]] = None):
     container = st.container()
     
     media_type = item.get('media_type', '')
@@ -38,6 +48,10 @@ def display_media_item(item: Dict[str, Any], show_details: bool):
             st.code(item.get('prompt', ''), wrap_lines=True, language='txt')
             st.markdown(f"**ID:** {item.get('id', '')}")
             st.markdown(f"**모델:** {item.get('model_type', '')}")
+            # 목록 item 에 details 가 없으면 (projection) 선택 시에만 전체 record 를 조회
+            if load_item and 'details' not in item:
+                if st.toggle("상세 정보 불러오기", key=f"gallery-details-{item.get('id', '')}"):
+                    item = load_item(item) or item
             if details := item.get('details'):
                 st.markdown("**상세 정보:**")
                 st.json(json.loads(json.dumps(details, default=float)), expanded=False)
@@ -1,12 +1,17 @@
 import json
 import streamlit as st
-from typing import List
+from typing import Callable, List, Optional
 from genai_kit.utils.images import base64_to_image
 from enums import MediaType
 from utils import format_datetime
 
 
-def show_history(media_items: List[dict] = [], cols_per_row: int = 1, show_details: bool = False):
+def show_history(
+    media_items: List[dict] = [],
+    cols_per_row: int = 1,
+    show_details: bool = False,
+    load_item: Optional[Callable[[dict], dict]] = None,
+):
     st.title("📋 Request History")
 
     if media_items and len(media_items) > 0:
@@ -20,12 +25,18 @@ def show_history(media_items: List[dict] = [], cols_per_row: int = 1, show_detai
                     expanded=show_details,
                     icon=icon,
                 ):
-                    display_history_item(item)
+                    display_history_item(item, load_item)
     else:
         st.info("아직 요청 기록이 없습니다.")
 
 
-def display_history_item(item):
+def display_history_item(item, load_item: Optional[Callable[[dict], dict]] = None):
+    # 목록 item 에 ref_image / details 가 없으면 (projection) 선택 시에만 전체 record 를 조회
+    full_item = item
+    if load_item and 'details' not in item:
+        if st.toggle("참조 이미지 / 상세 정보 불러오기", key=f"history-details-{item['id']}"):
+            full_item = load_item(item) or item
+
     col1, col2 = st.columns([1, 3])
     
     with col1:
@@ -42,7 +53,7 @@ def display_history_item(item):
         st.text(media_type)
         st.text(item['model_type'])
 
-        ref_image = item.get('ref_image', None)
+        ref_image = full_item.get('ref_image', None)
         if ref_image:            
             st.image(base64_to_image(ref_image),width=400)
 
@@ -56,7 +67,8 @@ def display_history_item(item):
         elif url and media_type == MediaType.VIDEO.value:
             st.video(url)
                 
-        st.json(json.loads(json.dumps(item['details'], default=float)))
+        if 'details' in full_item:
+            st.json(json.loads(json.dumps(full_item['details'], default=float)))
 
 
 def _get_emoji(media_type: str):
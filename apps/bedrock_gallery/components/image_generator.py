@@ -11,7 +11,6 @@ from services.bedrock_service import (
     is_sd_model,
 )
 from session import SessionManager
-from enums import MediaType
 
 
 def show_image_generator(session_manager: SessionManager):
@@ -141,20 +140,21 @@ def generate_image(session_manager: SessionManager):
             # Display prompt and generated image
             st.info(st.session_state.image_prompt)
             cols = st.columns(len(imgs))
+            media_files = []
             for idx, img in enumerate(imgs):
                 with cols[idx]:
                     image_data = base64_to_bytes(img)
                     st.image(image_data, use_container_width=True)
+                    media_files.append(image_data)
             
-                # Add to history
-                session_manager.add_to_history(
-                    prompt=st.session_state.image_prompt,
-                    media_type = MediaType.IMAGE,
-                    model_type = model_type,
-                    media_file=image_data,
-                    details = configuration,
-                    ref_image = st.session_state.ref_image,
-                )
+            # Add to history (이미지를 한 번에 병렬 업로드)
+            session_manager.add_images_to_history(
+                prompt=st.session_state.image_prompt,
+                model_type = model_type,
+                media_files=media_files,
+                details = configuration,
+                ref_image = st.session_state.ref_image,
+            )
             
             status.update(label="Generation completed!", state="complete")
             
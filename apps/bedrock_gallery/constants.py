@@ -1,3 +1,8 @@
 VIDEO_PREFIX = "video"
 IMAGE_PREFIX = "image"
-VIDEO_OUTPUT_FILE = "output.mp4"
\ No newline at end of file
+VIDEO_OUTPUT_FILE = "output.mp4"
+# DynamoDB GSI (partition: media_type, sort: created_at)
+MEDIA_TYPE_INDEX = "media_type-created_at-index"
+# grid / history 목록에서 읽는 attribute (ref_image, details 는 펼칠 때 조회)
+# MEDIA_TYPE_INDEX 는 이 attribute 만 INCLUDE projection 하므로 (cdk_stack.py) 함께 변경해야 함
+MEDIA_LIST_FIELDS = ["id", "media_type", "model_type", "prompt", "url", "created_at", "updated_at"]
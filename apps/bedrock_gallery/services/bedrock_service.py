@@ -1,11 +1,11 @@
 from enum import Enum
-import boto3
 import re
 import json
 from typing import List, Optional, Dict, Any, Union
 from genai_kit.aws.amazon_image import ImageParams, NovaImageSize, TitanImageSize
 from genai_kit.aws.claude import BedrockClaude
 from genai_kit.aws.bedrock import BedrockModel
+from genai_kit.aws.client import get_client
 from genai_kit.aws.sd_image import BedrockStableDiffusion, SDImageSize
 from genai_kit.utils.converter import extract_xml_values
 from constants import VIDEO_PREFIX
@@ -228,7 +228,7 @@ def list_video_job(status: str = None, max_results: int = None):
     return jobs.get("asyncInvokeSummaries", [])
 
 def _get_bedrock_runtime():
-    return boto3.client(
+    return get_client(
             service_name = 'bedrock-runtime',
             region_name=config.BEDROCK_REGION
     )
@@ -1,20 +1,22 @@
 
-import boto3
-from typing import Dict, Any, BinaryIO, List, Optional
+from typing import Dict, Any, BinaryIO, List, Optional, Union
 from datetime import datetime
 from genai_kit.aws.bedrock import BedrockModel
-from genai_kit.aws.dynamodb import DynamoDB
+from genai_kit.aws.client import get_client
+from genai_kit.aws.dynamodb import BatchGetError, DynamoDB
+from genai_kit.aws.s3 import S3
 from genai_kit.utils.random import random_id
 from services.bedrock_service import list_video_job
 from utils import extract_key_from_uri
 from enums import MediaType
 from config import config
-from constants import IMAGE_PREFIX, VIDEO_OUTPUT_FILE, VIDEO_PREFIX
+from constants import IMAGE_PREFIX, MEDIA_LIST_FIELDS, MEDIA_TYPE_INDEX, VIDEO_OUTPUT_FILE, VIDEO_PREFIX
 
 
 class StorageService:
     def __init__(self, bucket_name: str, cloudfront_domain: str):
-        self.s3_client = boto3.client('s3')
+        self.s3_client = get_client('s3')
+        self.s3 = S3(bucket_name=bucket_name, region=None)
         self.dynamodb = DynamoDB(table_name=config.DYNAMO_TABLE)
         self.bucket_name = bucket_name
         self.cloudfront_domain = cloudfront_domain
@@ -55,48 +57,70 @@ class StorageService:
         media_file: Optional[BinaryIO] = None,
         ref_image: Optional[str] = None,
         id: Optional[str] = None,
+        url: Optional[str] = None,
     ) -> Dict[str, Any]:
         image_id = id or random_id()
         key = f"{IMAGE_PREFIX}/{image_id}"
         now = datetime.now().isoformat()
-        url = None
 
         if media_file:
             url = self.upload_to_s3(media_file, key)
 
         url = url or f"{self.cloudfront_domain}/{key}"
-        record = {
-            "id": image_id,
-            "media_type": MediaType.IMAGE.value,
-            "model_type": model_type,
-            "prompt": prompt,
-            "ref_image": ref_image,
-            "url": url,
-            "updated_at": now,
-            "details": details
-        }
-
         try:
-            existing_item = self.dynamodb.get_item(image_id)
-            
-            if existing_item:
-                updates = {
-                    'model_type': model_type,
-                    'url': record['url'],
-                    'updated_at': now,
-                    'details': details
-                }
-                
-                self.dynamodb.update_item(image_id, updates)
-                record = self.dynamodb.get_item(image_id)
-            else:
-                record['created_at'] = now
-                self.dynamodb.put_item(record)
-
+            return self.dynamodb.upsert(
+                image_id,
+                updates={
+                    "model_type": model_type,
+                    "url": url,
+                    "updated_at": now,
+                    "details": details,
+                },
+                if_not_exists={
+                    "media_type": MediaType.IMAGE.value,
+                    "prompt": prompt,
+                    "ref_image": ref_image,
+                    "created_at": now,
+                },
+            )
         except Exception as e:
             raise Exception(f"Failed to store metadata in DynamoDB: {str(e)}")
+    
+    def upload_images(
+        self,
+        model_type: str,
+        prompt: str,
+        details: Dict[str, Any],
+        media_files: List[BinaryIO],
+        ref_image: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        생성된 이미지들을 S3 에 병렬로 업로드한 뒤 metadata 를 저장합니다.
+        """
+        image_ids = [random_id() for _ in media_files]
+        report = self.s3.upload_many([
+            (media_file, f"{IMAGE_PREFIX}/{image_id}.png", None, {'ContentType': 'image/png'})
+            for image_id, media_file in zip(image_ids, media_files)
+        ])
+        failed = {key for key, _ in report['errors']}
+
+        records = []
+        for image_id in image_ids:
+            filename = f"{IMAGE_PREFIX}/{image_id}.png"
+            if filename in failed:
+                continue
+            records.append(self.upload_image(
+                model_type=model_type,
+                prompt=prompt,
+                details=details,
+                ref_image=ref_image,
+                id=image_id,
+                url=f"{self.cloudfront_domain}/{filename}",
+            ))
 
-        return record
+        if failed:
+            raise Exception(f"Failed to upload {len(failed)} image(s) to S3: {report['errors']}")
+        return records
     
     def update_video_status(
         self,
@@ -110,72 +134,127 @@ class StorageService:
         key = f"{VIDEO_PREFIX}/{id}"
         now = datetime.now().isoformat()
         
-        record = {
-            "id": id,
-            "media_type": MediaType.VIDEO.value,
-            "model_type": model_type,
-            "prompt": prompt,
-            "ref_image": ref_image,
-            "url": f"{self.cloudfront_domain}/{key}/{VIDEO_OUTPUT_FILE}",
-            "updated_at": now,
-            "details": details
-        }
-
         try:
-            existing_item = self.dynamodb.get_item(id)
-            
-            if existing_item:
-                updates = {
-                    'url': record['url'],
-                    'updated_at': now,
-                    'details': details
-                }
-                
-                self.dynamodb.update_item(id, updates)
-                record = self.dynamodb.get_item(id)
-            else:
-                record['created_at'] = now
-                self.dynamodb.put_item(record)
-
+            return self.dynamodb.upsert(
+                id,
+                updates={
+                    "url": f"{self.cloudfront_domain}/{key}/{VIDEO_OUTPUT_FILE}",
+                    "updated_at": now,
+                    "details": details,
+                },
+                if_not_exists={
+                    "media_type": MediaType.VIDEO.value,
+                    "model_type": model_type,
+                    "prompt": prompt,
+                    "ref_image": ref_image,
+                    "created_at": now,
+                },
+            )
         except Exception as e:
             raise Exception(f"Failed to store metadata in DynamoDB: {str(e)}")
 
-        return record
-
     def get_media_list(
         self,
-        media_type: str = None,
+        media_type: Union[str, List[str]] = None,
         sync=True,
+        limit: Optional[int] = None,
+        projection: Optional[List[str]] = MEDIA_LIST_FIELDS,
     ) -> List[Dict[str, Any]]:
+        """
+        media_type (하나 또는 목록) 별로 GSI 를 조회하여 최신순으로 반환합니다. limit 이 없으면 모든 page 를 읽습니다.
+        GSI 에는 목록용 attribute (MEDIA_LIST_FIELDS) 만 projection 되어 있으므로, ref_image / details 는 get_media_item 으로 조회합니다.
+        """
         try:
             if sync:
                 self.sync_video_jobs()
 
-            if media_type:
-                query = {
-                    'FilterExpression': '#type = :type_val',
-                    'ExpressionAttributeNames': {'#type': 'media_type'},
-                    'ExpressionAttributeValues': {':type_val': media_type}
-                }
-                response = self.dynamodb.scan_items(query)
+            if isinstance(media_type, list):
+                media_types = media_type
             else:
-                response = self.dynamodb.scan_items({})
-                
-            return response.get('Items', [])
+                media_types = [media_type] if media_type else [type.value for type in MediaType]
+            items = []
+            for type in media_types:
+                items.extend(self._query_media(type, limit, projection))
+
+            items = sorted(items, key=lambda x: x.get('created_at', ''), reverse=True)
+            return items[:limit] if limit else items
         except Exception as e:
             raise Exception(f"Failed to retrieve media list: {str(e)}")
+
+    def get_media_page(
+        self,
+        media_type: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        projection: Optional[List[str]] = MEDIA_LIST_FIELDS,
+    ):
+        """
+        Returns:
+            (list, str): 최신순 items, 다음 page cursor
+        """
+        return self.dynamodb.query_page(MEDIA_TYPE_INDEX, media_type, limit=limit, cursor=cursor, projection=projection)
+
+    def get_media_item(self, id: str) -> Optional[Dict[str, Any]]:
+        """
+        ref_image / details 를 포함한 전체 record 를 조회합니다.
+        """
+        try:
+            return self.dynamodb.get_item(id)
+        except Exception as e:
+            raise Exception(f"Failed to retrieve media item: {str(e)}")
+
+    def get_pending_video_jobs(self) -> List[Dict[str, Any]]:
+        """
+        status 가 InProgress 인 video record 를 details 와 함께 반환합니다.
+        GSI 에는 details 가 projection 되지 않으므로 id 만 GSI 로 찾고 record 는 batch_get 으로 조회합니다.
+        """
+        try:
+            ids = [item['id'] for item in self._query_media(MediaType.VIDEO.value, projection=["id"])]
+            try:
+                items = self.dynamodb.batch_get(ids, projection=["details.status", "details.invocationArn"])
+            except BatchGetError as e:
+                print(f"Skipping video jobs not read: {[id for id, _ in e.errors]}")
+                items = e.items
+            return [item for item in items if item.get('details', {}).get('status') == 'InProgress']
+        except Exception as e:
+            raise Exception(f"Failed to retrieve pending video jobs: {str(e)}")
+
+    def _query_media(
+        self,
+        media_type: str,
+        limit: Optional[int] = None,
+        projection: Optional[List[str]] = MEDIA_LIST_FIELDS,
+    ) -> List[Dict[str, Any]]:
+        items, cursor = [], None
+        while True:
+            page_size = min(100, limit - len(items)) if limit else 100
+            page, cursor = self.get_media_page(media_type, limit=page_size, cursor=cursor, projection=projection)
+            items.extend(page)
+            if not cursor or (limit and len(items) >= limit):
+                return items
         
     def sync_video_jobs(self) -> None:
         try:
             job_list = list_video_job(max_results=10)
-            media_list = self.get_media_list(media_type=MediaType.VIDEO.value, sync=False)
-            media_map = {item['id']: item for item in media_list}
-        
+            jobs = {}
             for job in job_list:
                 job_id = extract_key_from_uri(
                     job.get('outputDataConfig', {}).get('s3OutputDataConfig', {}).get('s3Uri', '')
                 )
-                if not job_id or job_id not in media_map:
+                if job_id:
+                    jobs[job_id] = job
+
+            # 최근 job 의 record 만 id 로 조회 (video 전체를 읽지 않음)
+            try:
+                media_list = self.dynamodb.batch_get(list(jobs), projection=["id", "details.status"])
+            except BatchGetError as e:
+                # 읽지 못한 job 은 다음 sync 에서 다시 확인
+                print(f"Skipping video jobs not read: {[id for id, _ in e.errors]}")
+                media_list = e.items
+            media_map = {item['id']: item for item in media_list}
+        
+            for job_id, job in jobs.items():
+                if job_id not in media_map:
                     continue
                 
                 job_status = job.get('status')
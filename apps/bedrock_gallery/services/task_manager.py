@@ -2,7 +2,6 @@ import asyncio
 from typing import Dict, Optional
 from datetime import datetime
 import streamlit as st
-from apps.bedrock_gallery.types import MediaType
 from services.bedrock_service import get_video_job
 from services.storage_service import StorageService
 
@@ -56,10 +55,9 @@ class AsyncTaskManager:
         return self.tasks.get(task_id)
     
     def _restore_pending_tasks(self):
-        pending_tasks = self.storage_service.get_media_list(media_type=MediaType.VIDEO.value)
+        pending_tasks = self.storage_service.get_pending_video_jobs()
         for task in pending_tasks:
-            if task.get('details', {}).get('status') == 'InProgress':
-                self.start_video_polling(
-                    task_id=task['id'],
-                    invocation_arn=task['details']['invocationArn']
-                )
\ No newline at end of file
+            self.start_video_polling(
+                task_id=task['id'],
+                invocation_arn=task['details']['invocationArn']
+            )
\ No newline at end of file
@@ -1,5 +1,5 @@
 import streamlit as st
-from typing import Dict, Any, BinaryIO, Optional
+from typing import Dict, Any, BinaryIO, List, Optional, Union
 from genai_kit.aws.bedrock import BedrockModel
 from services.storage_service import StorageService
 from config import config
@@ -42,10 +42,54 @@ class SessionManager:
         st.session_state.request_history.insert(0, storage_metadata)
         return storage_metadata
     
-    def get_history(self, media_type: str = None):
+    def add_images_to_history(
+        self,
+        prompt: str,
+        model_type: BedrockModel,
+        media_files: List[BinaryIO],
+        details: Optional[Dict[str, Any]] = None,
+        ref_image: Optional[str] = None,
+    ):
+        if 'request_history' not in st.session_state:
+            st.session_state.request_history = []
+
+        try:
+            records = self.storage_service.upload_images(
+                model_type=model_type.value,
+                prompt=prompt,
+                details=details,
+                media_files=media_files,
+                ref_image=ref_image,
+            )
+        except Exception as e:
+            st.error(f"Failed to upload media: {str(e)}")
+            return None
+
+        st.session_state.request_history[:0] = records
+        return records
+    
+    def get_history(self, media_type: Union[str, List[str]] = None, limit: Optional[int] = None):
         return self.storage_service.get_media_list(
             media_type=media_type,
+            limit=limit,
         )
 
+    def get_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        목록의 thin row 로 ref_image / details 를 포함한 전체 record 를 조회합니다.
+        (id, updated_at) 별로 session 에 보관하므로 다시 펼쳐도 재조회하지 않습니다.
+        """
+        if 'media_items' not in st.session_state:
+            st.session_state.media_items = {}
+
+        key = (item['id'], item.get('updated_at'))
+        if key not in st.session_state.media_items:
+            try:
+                st.session_state.media_items[key] = self.storage_service.get_media_item(item['id'])
+            except Exception as e:
+                st.error(f"Failed to load media item: {str(e)}")
+                return None
+        return st.session_state.media_items[key]
+
     def clear_history(self):
         st.session_state.request_history = []
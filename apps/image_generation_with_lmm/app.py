@@ -26,6 +26,8 @@ from genai_kit.utils.time import getDatetimeStr
 CDN_URL = "" # Your CloudFront Endpoint URL
 S3_BUCKET = "" # Your S3 Bucket Name
 DYNAMODB_TABLE = "" # Your DynamoDB Table Name
+GALLERY_INDEX = "media_type-created-index" # DynamoDB GSI (partition key: media_type, sort key: created)
+GALLERY_LIMIT = 100
 
 s3 = S3(bucket_name=S3_BUCKET)
 db = DynamoDB(table_name=DYNAMODB_TABLE)
@@ -170,12 +172,13 @@ def generate_images(selected_prompts, num_images, cfg_scale, seed, selected_size
         return image_prompt, imgs, cfg
     
     def _show_and_upload_images(results = []):
+        uploads = []
         for image_prompt, imgs, cfg in results:
             st.info(image_prompt)
             cols = st.columns(len(imgs))
             for idx, img in enumerate(imgs):
                 with cols[idx]:
-                    image_data = BytesIO(base64.b64decode(img))
+                    image_data = base64.b64decode(img)
 
                     try:
                         tags = json.loads(gen_tags(img))
@@ -184,14 +187,11 @@ def generate_images(selected_prompts, num_images, cfg_scale, seed, selected_size
 
                     st.image(image_data)
                     st.write(tags)
+                    uploads.append((image_data, image_prompt, cfg, tags))
 
-                    with st.spinner("Upload..."):
-                        upload_image(
-                            image=image_data,
-                            prompt=image_prompt,
-                            cfg=cfg,
-                            tags=tags
-                        )
+        # 생성된 이미지를 한 번에 병렬 업로드
+        with st.spinner("Upload..."):
+            upload_images(uploads)
     
     st.divider()
     st.subheader("Image Generation")
@@ -212,25 +212,45 @@ def generate_images(selected_prompts, num_images, cfg_scale, seed, selected_size
         _show_and_upload_images(results)
 
 def upload_image(image: bytes, prompt: str, cfg: dict, tags = []):
-    image_id = f"{uuid.uuid4()}.png"
-    s3.upload_object(key=image_id, bytes=image, extra_args={'ContentType': 'image/png'})
-    db.put_item({
-        "id": image_id,
-        "url": f"{CDN_URL}/{image_id}",
-        "prompt": prompt,
-        "config": cfg,
-        "tags": tags,
-        "created": getDatetimeStr()
-    })
+    upload_images([(image, prompt, cfg, tags)])
+
+
+def upload_images(images):
+    """
+    images: (image bytes, prompt, cfg, tags) 목록
+    """
+    items = [(f"{uuid.uuid4()}.png", image, prompt, cfg, tags) for image, prompt, cfg, tags in images]
+    report = s3.upload_many([
+        (image if hasattr(image, "read") else BytesIO(image), image_id, None, {"ContentType": "image/png"})
+        for image_id, image, _, _, _ in items
+    ])
+    for key, error in report['errors']:
+        st.error(f"Upload failed: {key} ({error})")
+
+    failed = {key for key, _ in report['errors']}
+    result = db.batch_put([
+        {
+            "id": image_id,
+            "media_type": "image",
+            "url": f"{CDN_URL}/{image_id}",
+            "prompt": prompt,
+            "config": cfg,
+            "tags": tags,
+            "created": getDatetimeStr()
+        }
+        for image_id, _, prompt, cfg, tags in items
+        if image_id not in failed
+    ])
+    for image_id, error in result['errors']:
+        st.error(f"Save failed: {image_id} ({error})")
 
 
 def render_gallery():
-    items = db.scan_items({}).get("Items")
+    # 전체 table scan 대신 GSI 에서 최신순으로 GALLERY_LIMIT 개만 조회
+    columns = ["url", "prompt", "tags", "config", "created"]
+    items, _ = db.query_page(GALLERY_INDEX, "image", limit=GALLERY_LIMIT, projection=columns)
     
-    df = pd.DataFrame(
-        items,
-        columns=["url", "prompt", "tags", "config", "created"],
-    )
+    df = pd.DataFrame(items, columns=columns)
     df["config"] = df["config"].apply(lambda x: json.dumps(x, default=_decimal_default))
     df = df.sort_values(by="created", ascending=False)
     
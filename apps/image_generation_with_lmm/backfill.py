@@ -0,0 +1,43 @@
+'''
+media_type 이 없는 기존 image record 에 media_type = "image" 를 채웁니다. (한 번만 실행)
+
+gallery 는 media_type-created-index GSI 만 조회하는데, 이전 버전의 upload_image 는 media_type 을
+저장하지 않았으므로 그 record 들은 sparse index 에 들어가지 않아 gallery 에 보이지 않습니다.
+
+    python backfill.py <DynamoDB table name>
+'''
+import os
+import sys
+
+ROOT_PATH = os.path.abspath("../../")
+sys.path.append(ROOT_PATH)
+
+import argparse
+from boto3.dynamodb.conditions import Attr
+from genai_kit.aws.dynamodb import DynamoDB
+
+
+def backfill_media_type(db: DynamoDB, total_segments: int = 4) -> dict:
+    items = [
+        {**item, "media_type": "image"}
+        for item in db.parallel_scan(total_segments=total_segments, filter=Attr("media_type").not_exists())
+    ]
+    if not items:
+        return {'success': 0, 'failed': 0, 'errors': []}
+    return db.batch_put(items)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('table')
+    parser.add_argument('--segments', type=int, default=4)
+    args = parser.parse_args()
+
+    result = backfill_media_type(DynamoDB(table_name=args.table), args.segments)
+    print(f"backfilled {result['success']} items, {result['failed']} failed")
+    for id, error in result['errors']:
+        print(f"  {id}: {error}")
+
+
+if __name__ == '__main__':
+    main()
@@ -39,6 +39,9 @@ from genai_kit.aws.claude import BedrockClaude
 from genai_kit.aws.bedrock import BedrockModel
 from genai_kit.utils.images import encode_image_base64, encode_image_base64_from_file, display_image, resize_image_aspect_ratio
 from genai_kit.aws.amazon_image import BedrockAmazonImage, TitanImageSize, ImageParams, ControlMode, OutpaintMode
+from genai_kit.aws.opensearch import compile_filter
+from genai_kit.aws.s3 import S3ObjectCache
+from genai_kit.utils.cache import MemoryCache, make_cache_key
 
 
 from langchain.prompts import PromptTemplate
@@ -175,6 +178,18 @@ GENERAL_CONVERSATION_TEMPLATE = '''
 '''
 
 
+@st.cache_resource
+def get_search_cache():
+    """rerun / 사용자 간에 공유되는 query embedding 및 검색 결과 cache"""
+    return MemoryCache(max_items=512, ttl=300)
+
+
+@st.cache_resource
+def get_image_cache():
+    """Amazon Berkeley Objects 이미지 local disk cache (변하지 않는 dataset 이므로 하루 동안 재검증 생략)"""
+    return S3ObjectCache(max_age=24 * 3600)
+
+
 class MultimodalAgentSystem:
     def __init__(self, region='us-west-2'):
         self.region = region
@@ -187,6 +202,7 @@ class MultimodalAgentSystem:
         """AWS 클라이언트 초기화"""
         self.boto3_session = boto3.session.Session(region_name=self.region)
         self.s3_client = self.boto3_session.client('s3')
+        self.image_cache = get_image_cache()
         
         # OpenSearch 설정 불러오기
         with open("oss_policies_info.json", "r") as f:
@@ -212,7 +228,8 @@ class MultimodalAgentSystem:
     def initialize_models(self):
         """모델 초기화"""
         self.claude = BedrockClaude(region=self.region, modelId=BedrockModel.HAIKU_3_5_CR)
-        self.bedrock_embedding = BedrockEmbedding(region=self.region)
+        self.search_cache = get_search_cache()
+        self.bedrock_embedding = BedrockEmbedding(region=self.region, cache=self.search_cache)
         
         # Langchain 모델 초기화
         self.llm = self.claude.get_chat_model()
@@ -317,10 +334,21 @@ class MultimodalAgentSystem:
         
         return "\n".join(products_info)
     
-    def find_similar_items(self, text=None, image=None, k=5):
-        """유사 상품 검색"""
+    def find_similar_items(self, text=None, image=None, k=5, filter=None):
+        """유사 상품 검색
+
+        filter: {'metadata.product_type': 'CHAIR', 'metadata.node': [...]} 형태로 주면
+        knn 안의 efficient filter 로 적용되어 client 에서 over-fetch 후 거를 필요가 없음
+        """
         query_emb = self.bedrock_embedding.embedding_multimodal(text=text, image=image)
 
+        knn = {
+            "vector": query_emb,
+            "k": k,
+        }
+        if filter:
+            knn["filter"] = compile_filter(filter)
+
         body = {
             "size": k,
             "_source": {
@@ -328,16 +356,21 @@ class MultimodalAgentSystem:
             },
             "query": {
                 "knn": {
-                    "image_vector": {
-                        "vector": query_emb,
-                        "k": k,
-                    }
+                    "image_vector": knn
                 }
             },
         }
 
+        # 이 앱은 index 에 쓰지 않으므로 TTL 만료로 충분
+        key = make_cache_key('find_similar_items', self.host, self.index_name, body)
+        if (cached := self.search_cache.get(key)) is not None:
+            return cached
+
         res = self.oss_client.search(index=self.index_name, body=body)
-        return res["hits"]["hits"]
+        hits = res["hits"]["hits"]
+        if hits:
+            self.search_cache.set(key, hits)
+        return hits
     
     def process_search_results(self, documents):
         """검색 결과 처리"""
@@ -348,11 +381,11 @@ class MultimodalAgentSystem:
             score = doc.get('_score', 0)
 
             try:
-                img_res = self.s3_client.get_object(
-                    Bucket="amazon-berkeley-objects",
-                    Key=f"images/small/{metadata.get('image_url', '')}"
+                img_content = self.image_cache.get(
+                    "amazon-berkeley-objects",
+                    f"images/small/{metadata.get('image_url', '')}"
                 )
-                img = Image.open(BytesIO(img_res['Body'].read()))
+                img = Image.open(BytesIO(img_content))
                 img_base64 = encode_image_base64(img) if img else ''
             except Exception as e:
                 st.error(f"이미지 로드 오류: {str(e)}")
@@ -34,6 +34,8 @@ valid_embedding_models = [
     "cohere.embed-multilingual-v3", "cohere.embed-english-v3", "amazon.titan-embed-text-v1",
     "amazon.titan-embed-text-v2:0"
 ]
+titan_v2_dimensions_models = ["amazon.titan-embed-text-v2:0"]
+valid_embedding_dimensions = [256, 512, 1024]
 pp = pprint.PrettyPrinter(indent=2)
 
 
@@ -81,7 +83,8 @@ class KnowledgeBasesForAmazonBedrock:
             kb_name: str,
             kb_description: str = None,
             data_bucket_name: str = None,
-            embedding_model: str = "amazon.titan-embed-text-v2:0"
+            embedding_model: str = "amazon.titan-embed-text-v2:0",
+            embedding_dimensions: int = 1024
     ):
         """
         Function used to create a new Knowledge Base or retrieve an existent one
@@ -91,6 +94,7 @@ class KnowledgeBasesForAmazonBedrock:
             kb_description: Knowledge Base Description
             data_bucket_name: Name of s3 Bucket containing Knowledge Base Data
             embedding_model: Name of Embedding model to be used on Knowledge Base creation
+            embedding_dimensions: Vector dimension of the index (256, 512 or 1024 for amazon.titan-embed-text-v2:0)
 
         Returns:
             kb_id: str - Knowledge base id
@@ -126,6 +130,8 @@ class KnowledgeBasesForAmazonBedrock:
             if embedding_model not in valid_embedding_models:
                 valid_embeddings_str = str(valid_embedding_models)
                 raise ValueError(f"Invalid embedding model. Your embedding model should be one of {valid_embeddings_str}")
+            if embedding_model in titan_v2_dimensions_models and embedding_dimensions not in valid_embedding_dimensions:
+                raise ValueError(f"Invalid embedding dimensions. Should be one of {valid_embedding_dimensions}")
             # self.embedding_model = embedding_model
             encryption_policy_name = f"{kb_name}-sp-{self.suffix}"
             network_policy_name = f"{kb_name}-np-{self.suffix}"
@@ -167,12 +173,13 @@ class KnowledgeBasesForAmazonBedrock:
 
             print("========================================================================================")
             print(f"Step 5 - Creating OSS Vector Index")
-            self.create_vector_index(index_name)
+            self.create_vector_index(index_name, dimension=embedding_dimensions)
             print("========================================================================================")
             print(f"Step 6 - Creating Knowledge Base")
             knowledge_base, data_source = self.create_knowledge_base(
                 collection_arn, index_name, data_bucket_name, embedding_model,
-                kb_name, kb_description, bedrock_kb_execution_role
+                kb_name, kb_description, bedrock_kb_execution_role,
+                embedding_dimensions=embedding_dimensions
             )
             interactive_sleep(60)
             print("========================================================================================")
@@ -511,29 +518,39 @@ class KnowledgeBasesForAmazonBedrock:
             print("Policy already exists")
             pp.pprint(e)
 
-    def create_vector_index(self, index_name: str):
+    def create_vector_index(self, index_name: str, dimension: int = 1024, space_type: str = "l2",
+                            m: int = None, ef_construction: int = None, ef_search: int = 512):
         """
         Create OpenSearch Serverless vector index. If existent, ignore
         Args:
             index_name: name of the vector index
+            dimension: dimension of the embedding vectors
+            space_type: distance function of the vector field
+            m, ef_construction, ef_search: HNSW parameters (see genai_kit/benchmark/hnsw_tuning.py),
+                engine defaults are used for m / ef_construction when not given
         """
+        method = {
+            "name": "hnsw",
+            "engine": "faiss",
+            "space_type": space_type
+        }
+        parameters = {k: v for k, v in (("m", m), ("ef_construction", ef_construction)) if v is not None}
+        if parameters:
+            method["parameters"] = parameters
+
         body_json = {
             "settings": {
                 "index.knn": "true",
                 "number_of_shards": 1,
-                "knn.algo_param.ef_search": 512,
+                "knn.algo_param.ef_search": ef_search,
                 "number_of_replicas": 0,
             },
             "mappings": {
                 "properties": {
                     "vector": {
                         "type": "knn_vector",
-                        "dimension": 1024,
-                        "method": {
-                            "name": "hnsw",
-                            "engine": "faiss",
-                            "space_type": "l2"
-                        },
+                        "dimension": dimension,
+                        "method": method,
                     },
                     "text": {
                         "type": "text"
@@ -562,7 +579,8 @@ class KnowledgeBasesForAmazonBedrock:
     @retry(wait_random_min=1000, wait_random_max=2000, stop_max_attempt_number=7)
     def create_knowledge_base(
             self, collection_arn: str, index_name: str, bucket_name: str, embedding_model: str,
-            kb_name: str, kb_description: str, bedrock_kb_execution_role: str
+            kb_name: str, kb_description: str, bedrock_kb_execution_role: str,
+            embedding_dimensions: int = 1024
     ):
         """
         Create Knowledge Base and its Data Source. If existent, retrieve
@@ -606,11 +624,18 @@ class KnowledgeBasesForAmazonBedrock:
 
         # The embedding model used by Bedrock to embed ingested documents, and realtime prompts
         embedding_model_arn = f"arn:aws:bedrock:{self.region_name}::foundation-model/{embedding_model}"
+        vector_kb_configuration = {
+            "embeddingModelArn": embedding_model_arn
+        }
+        if embedding_model in titan_v2_dimensions_models:
+            vector_kb_configuration["embeddingModelConfiguration"] = {
+                "bedrockEmbeddingModelConfiguration": {
+                    "dimensions": embedding_dimensions
+                }
+            }
         print(str({
             "type": "VECTOR",
-            "vectorKnowledgeBaseConfiguration": {
-                "embeddingModelArn": embedding_model_arn
-            }
+            "vectorKnowledgeBaseConfiguration": vector_kb_configuration
         }))
         try:
             create_kb_response = self.bedrock_agent_client.create_knowledge_base(
@@ -619,9 +644,7 @@ class KnowledgeBasesForAmazonBedrock:
                 roleArn=bedrock_kb_execution_role['Role']['Arn'],
                 knowledgeBaseConfiguration={
                     "type": "VECTOR",
-                    "vectorKnowledgeBaseConfiguration": {
-                        "embeddingModelArn": embedding_model_arn
-                    }
+                    "vectorKnowledgeBaseConfiguration": vector_kb_configuration
                 },
                 storageConfiguration={
                     "type": "OPENSEARCH_SERVERLESS",
@@ -1,16 +1,16 @@
-import boto3
 import json
 import secrets
 from enum import Enum
 from typing import List, Optional
 from botocore.config import Config
+from genai_kit.aws.client import get_client
 
 
 class BedrockAmazonImage():
     def __init__(self, region='us-east-1', modelId = 'amazon.titan-image-generator-v2:0'):
         self.region = region
         self.modelId = modelId
-        self.bedrock = boto3.client(
+        self.bedrock = get_client(
             service_name = 'bedrock-runtime',
             region_name=self.region,
             config = Config(
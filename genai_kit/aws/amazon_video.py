@@ -1,12 +1,12 @@
 from apps.bedrock_gallery.constants import VIDEO_OUTPUT_FILE
-import boto3
 import json
 import secrets
 from enum import Enum
 from typing import List, Optional
 from botocore.config import Config
+from genai_kit.aws.client import get_client
 from genai_kit.aws.bedrock import BedrockModel
-from genai_kit.aws.s3 import S3
+from genai_kit.aws.s3 import S3, S3ObjectCache
 
 
 class VideoStatus(Enum):
@@ -19,11 +19,14 @@ class BedrockAmazonVideo():
     def __init__(self,
                  bucket_name: str,
                  region='us-east-1',
-                 modelId = BedrockModel.NOVA_REAL):
+                 modelId = BedrockModel.NOVA_REAL,
+                 cache: Optional[S3ObjectCache] = None):
         self.bucket_name = bucket_name
         self.region = region
         self.modelId = modelId
-        self.bedrock = boto3.client(
+        # 생성된 video 의 local disk cache (get_video)
+        self.cache = cache or S3ObjectCache()
+        self.bedrock = get_client(
             service_name = 'bedrock-runtime',
             region_name=self.region,
             config = Config(
@@ -112,7 +115,10 @@ class BedrockAmazonVideo():
             for job in jobs.get("asyncInvokeSummaries", [])
         ]
     
-    def get_video(self, invocation_arn: str = None, s3Uri: str = None):
+    def get_video(self, invocation_arn: str = None, s3Uri: str = None, stream: bool = False):
+        """
+        stream=True 이면 bytes 대신 S3 StreamingBody 를 반환하여 큰 video 도 일정한 메모리로 처리할 수 있습니다.
+        """
         if not s3Uri and not invocation_arn:
             raise ValueError("Either 's3Uri' or 'invocation_arn' must be provided.")
         
@@ -123,6 +129,8 @@ class BedrockAmazonVideo():
             if not s3Uri:
                 raise ValueError(f"No S3 URI found for invocation ARN: {invocation_arn}")
         
-        s3 = S3(bucket_name=self.bucket_name)
+        s3 = S3(bucket_name=self.bucket_name, cache=self.cache)
         key = s3.extract_key_from_uri(s3Uri)
+        if stream:
+            return s3.open_stream(f"{key}/{VIDEO_OUTPUT_FILE}")
         return s3.get_object(f"{key}/{VIDEO_OUTPUT_FILE}")
\ No newline at end of file
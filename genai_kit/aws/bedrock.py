@@ -1,5 +1,5 @@
-import boto3
 from enum import Enum
+from genai_kit.aws.client import get_client
 
 
 class BedrockModel(str, Enum):
@@ -29,7 +29,7 @@ class BedrockModel(str, Enum):
 class BedrockWrapper():
     def __init__(self, region='us-west-2'):
         self.region = region
-        self.client = boto3.client(
+        self.client = get_client(
             service_name="bedrock",
             region_name=self.region,
         )
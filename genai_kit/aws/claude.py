@@ -1,25 +1,41 @@
-import boto3
 import json
+import asyncio
+import functools
+from typing import List
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from botocore.config import Config
 
 from langchain_aws.chat_models import ChatBedrock
 from langchain.callbacks import StdOutCallbackHandler
 
+from genai_kit.aws.client import get_client
+from genai_kit.utils.cache import make_cache_key
+from genai_kit.utils.rate_limit import get_rate_limiter
+
 
 class BedrockClaude():
-    def __init__(self, region='us-west-2', modelId = 'anthropic.claude-3-5-sonnet-20240620-v1:0', **model_kwargs):
+    def __init__(self, region='us-west-2', modelId = 'anthropic.claude-3-5-sonnet-20240620-v1:0', max_concurrency: int = 10, cache=None, **model_kwargs):
         self.region = region
         self.modelId = modelId
-        self.bedrock = boto3.client(
+        self.max_concurrency = max_concurrency
+        # opt-in response cache (genai_kit.utils.cache.MemoryCache / SQLiteCache)
+        self.cache = cache
+        self.bedrock = get_client(
             service_name = 'bedrock-runtime',
             region_name = self.region,
             config = Config(
                 connect_timeout=120,
                 read_timeout=120,
-                retries={'max_attempts': 5}
+                retries={'max_attempts': 5},
+                max_pool_connections=max_concurrency,
             ),
         )
 
+        # async API 에서 사용하는 worker pool / semaphore (lazy init)
+        self._executor = None
+        self._semaphore = None
+        self._semaphore_loop = None
+
         self.model_kwargs = {
             'anthropic_version': 'bedrock-2023-05-31',
             "max_tokens": 4096, # max tokens
@@ -92,6 +108,10 @@ class BedrockClaude():
             }]
         })
 
+        key = self._cache_key('invoke_model', parameter)
+        if (cached := self._cache_get(key)) is not None:
+            return cached
+
         try:
             response = self.bedrock.invoke_model(
                 body=json.dumps(parameter),
@@ -99,7 +119,9 @@ class BedrockClaude():
                 accept='application/json',
                 contentType='application/json'
             )
-            return json.loads(response.get('body').read())
+            result = json.loads(response.get('body').read())
+            self._cache_set(key, result)
+            return result
         except Exception as e:
             print(e)
             return None
@@ -116,6 +138,34 @@ class BedrockClaude():
         Returns:
             str: 어시스턴트의 응답 텍스트
         '''
+        try:
+            return self._converse(text=text, image=image, system=system)
+        except Exception as e:
+            print(e)
+            return None
+
+    def _converse(self, text: str, image: bytes = None, system: str = None, before_call=None):
+        messages, system_prompts = self._converse_messages(text, image, system)
+
+        key = self._cache_key('converse', self.inference_config, messages, system_prompts)
+        if (cached := self._cache_get(key)) is not None:
+            return cached
+
+        # cache miss 로 실제 Bedrock 을 호출하기 직전에만 실행 (예: rate limit)
+        if before_call:
+            before_call()
+
+        response = self.bedrock.converse(
+            modelId=self.modelId,
+            messages=messages,
+            system=system_prompts,
+            inferenceConfig=self.inference_config,
+            # additionalModelRequestFields=self.additional_model_fields,
+        )
+        self._cache_set(key, response)
+        return response
+
+    def _converse_messages(self, text: str, image: bytes = None, system: str = None):
         # 메시지 내용 구성
         content = []
         if text:
@@ -143,18 +193,87 @@ class BedrockClaude():
         if system:
             system_prompts.append({'text': system})
 
-        try:
-            response = self.bedrock.converse(
-                modelId=self.modelId,
-                messages=messages,
-                system=system_prompts,
-                inferenceConfig=self.inference_config,
-                # additionalModelRequestFields=self.additional_model_fields,
-            )
+        return messages, system_prompts
+
+    '''
+    Bedrock Converse API: batched fan-out
+    '''
+    def converse_many(self,
+                      requests: List[dict],
+                      max_concurrency: int = None,
+                      rpm: int = None,
+                      tpm: int = None):
+        '''
+        여러 converse 요청을 worker pool 에서 실행합니다.
+        rpm / tpm 이 주어지면 modelId 별로 공유되는 token bucket 으로 요청 수와 토큰 수를 제한합니다.
+
+        Args:
+            requests (list): converse 인자 dict 목록 (예: [{'text': ..., 'image': ..., 'system': ...}])
+            max_concurrency (int): worker 수 (기본값: self.max_concurrency)
+            rpm (int): 분당 요청 수 제한
+            tpm (int): 분당 토큰 수 제한 (input + output)
+
+        Returns:
+            (list, list): 입력 순서의 응답 목록 (실패 시 None), 실패 목록 [(index, exception)]
+        '''
+        limiter = get_rate_limiter(self.modelId, rpm=rpm, tpm=tpm) if (rpm or tpm) else None
+
+        def _task(request: dict):
+            estimated = self._estimate_tokens(**request)
+            acquired = []
+
+            # cache hit 은 quota 를 소모하지 않으므로 Bedrock 호출 직전에만 rate limit 적용
+            def _acquire():
+                limiter.acquire(estimated)
+                acquired.append(True)
+
+            try:
+                response = self._converse(**request, before_call=_acquire if limiter else None)
+            except Exception:
+                if acquired:
+                    limiter.reconcile(estimated, 0)
+                raise
+            if acquired:
+                limiter.reconcile(estimated, response.get('usage', {}).get('totalTokens', estimated))
             return response
-        except Exception as e:
-            print(e)
+
+        results = [None] * len(requests)
+        failures = []
+        with ThreadPoolExecutor(max_workers=max_concurrency or self.max_concurrency) as executor:
+            futures = {executor.submit(_task, request): idx for idx, request in enumerate(requests)}
+            for future in as_completed(futures):
+                idx = futures[future]
+                try:
+                    results[idx] = future.result()
+                except Exception as e:
+                    failures.append((idx, e))
+
+        return results, sorted(failures, key=lambda x: x[0])
+
+    def _estimate_tokens(self, text: str = None, image: bytes = None, system: str = None) -> int:
+        # 대략 4 chars/token, 이미지는 최대 크기 기준 약 1,600 tokens
+        # Bedrock 은 요청 시점에 maxTokens 만큼을 quota 에서 미리 차감합니다.
+        tokens = (len(text or '') + len(system or '')) // 4
+        if image:
+            tokens += 1600
+        return tokens + self.inference_config.get('maxTokens', 0)
+
+    '''
+    Response cache
+    '''
+    def _cache_key(self, api: str, *parts):
+        if self.cache is None:
             return None
+        return make_cache_key(api, self.modelId, *parts)
+
+    def _cache_get(self, key):
+        if key is None:
+            return None
+        return self.cache.get(key)
+
+    def _cache_set(self, key, value):
+        if key is not None and value:
+            self.cache.set(key, value)
 
     '''
     Bedrock Converse Stream
@@ -163,32 +282,7 @@ class BedrockClaude():
         '''
         Generator that yields assistant's response chunks
         '''
-        # 메시지 내용 구성
-        content = []
-        if text:
-            content.append({'text': text})
-
-        if image:
-            content.append({
-                'image': {
-                    'format': 'png', # png, jpeg, gif, webp
-                    'source': {
-                        'bytes': image,
-                    }
-                }
-            })
-
-        # 사용자 메시지 생성
-        message = {
-            'role': 'user',
-            'content': content
-        }
-        messages = [message]
-
-        # 시스템 프롬프트 설정
-        system_prompts = []
-        if system:
-            system_prompts.append({'text': system})
+        messages, system_prompts = self._converse_messages(text, image, system)
 
         try:
             response = self.bedrock.converse_stream(
@@ -208,4 +302,52 @@ class BedrockClaude():
                             yield delta['text']
         except Exception as e:
             print(e)
-            return
\ No newline at end of file
+            return
+
+    '''
+    Async API: ainvoke_llm / aconverse / aconverse_stream
+    boto3 는 blocking client 이므로 max_concurrency 크기의 worker pool 에서 실행하고,
+    semaphore 로 동시에 진행 중인 요청 수를 제한합니다.
+    '''
+    async def ainvoke_llm(self, text: str, image: str = None, system: str = None):
+        return await self._run_async(self.invoke_llm, text, image, system)
+
+    async def ainvoke_llm_response(self, text: str, image: str = None, system: str = None):
+        return await self._run_async(self.invoke_llm_response, text, image, system)
+
+    async def aconverse(self, text: str, image: bytes = None, system: str = None):
+        return await self._run_async(self.converse, text, image, system)
+
+    async def aconverse_stream(self, text: str, image: bytes = None, system: str = None):
+        '''
+        Async generator that yields assistant's response chunks
+        '''
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            stream = self.converse_stream(text, image, system)
+            while True:
+                chunk = await loop.run_in_executor(self._get_executor(), next, stream, None)
+                if chunk is None:
+                    break
+                yield chunk
+
+    async def _run_async(self, func, *args):
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._get_executor(), functools.partial(func, *args))
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix='bedrock-claude',
+            )
+        return self._executor
+
+    def _get_semaphore(self):
+        # asyncio.Semaphore 는 event loop 에 묶이므로 loop 가 바뀌면 새로 생성
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphore_loop = loop
+        return self._semaphore
@@ -0,0 +1,116 @@
+import os
+import threading
+import boto3
+from typing import Optional
+from botocore.config import Config
+
+
+'''
+Process-wide boto3 client registry
+
+client 생성은 수십 ms 가 걸리고 매번 새로운 connection pool 을 만들기 때문에,
+(service, region, endpoint, config) 별로 하나의 client 를 만들어 공유합니다.
+boto3 client 는 생성 이후 thread-safe 합니다.
+resource 는 thread-safe 하지 않으므로 process 전체가 아닌 thread 별로 하나씩 만들어 재사용합니다.
+'''
+
+_default_options = {
+    'max_pool_connections': 50,
+    'tcp_keepalive': True,
+}
+
+_clients = {}
+_resources = threading.local()
+_lock = threading.Lock()
+_session = None
+_pid = None
+
+
+def configure(max_pool_connections: Optional[int] = None, tcp_keepalive: Optional[bool] = None):
+    '''
+    이후 생성되는 client 의 기본 connection pool 크기 / keep-alive 설정을 변경합니다.
+    '''
+    with _lock:
+        if max_pool_connections is not None:
+            _default_options['max_pool_connections'] = max_pool_connections
+        if tcp_keepalive is not None:
+            _default_options['tcp_keepalive'] = tcp_keepalive
+
+
+def get_client(service_name: str,
+               region_name: Optional[str] = None,
+               config: Optional[Config] = None,
+               endpoint_url: Optional[str] = None):
+    merged = _merge(config)
+    key = (service_name, region_name, endpoint_url, _config_key(merged))
+
+    client = _clients.get(key)
+    if client is not None and _pid == os.getpid():
+        return client
+
+    with _lock:
+        session = _get_session()
+        client = _clients.get(key)
+        if client is None:
+            client = session.client(
+                service_name,
+                region_name=region_name,
+                config=merged,
+                endpoint_url=endpoint_url,
+            )
+            _clients[key] = client
+        return client
+
+
+def get_resource(service_name: str,
+                 region_name: Optional[str] = None,
+                 config: Optional[Config] = None,
+                 endpoint_url: Optional[str] = None):
+    '''
+    호출한 thread 전용 resource 를 반환합니다. 다른 thread 와 공유하려면 resource.meta.client 를 사용하세요.
+    '''
+    merged = _merge(config)
+    key = (service_name, region_name, endpoint_url, _config_key(merged))
+
+    if getattr(_resources, 'pid', None) != os.getpid():
+        _resources.registry = {}
+        _resources.pid = os.getpid()
+
+    resource = _resources.registry.get(key)
+    if resource is None:
+        # boto3 Session 도 thread-safe 하지 않으므로 생성은 lock 안에서
+        with _lock:
+            resource = _get_session().resource(
+                service_name,
+                region_name=region_name,
+                config=merged,
+                endpoint_url=endpoint_url,
+            )
+        _resources.registry[key] = resource
+    return resource
+
+
+def clear():
+    with _lock:
+        _clients.clear()
+    _resources.registry = {}
+
+
+def _get_session():
+    # _lock 을 잡은 상태에서 호출
+    global _session, _pid
+
+    # fork 된 process 에서는 부모의 connection 을 재사용하지 않음
+    if _pid != os.getpid():
+        _clients.clear()
+        _session = boto3.session.Session()
+        _pid = os.getpid()
+    return _session
+
+
+def _merge(config: Optional[Config]) -> Config:
+    return Config(**_default_options).merge(config) if config else Config(**_default_options)
+
+
+def _config_key(config: Config):
+    return tuple(sorted((k, repr(v)) for k, v in config._user_provided_options.items()))
@@ -1,46 +1,368 @@
-import boto3
 import json
+import time
+import queue
+import base64
+import random
+import threading
 from decimal import Decimal
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from botocore.exceptions import ClientError
+from boto3.dynamodb.conditions import Attr, ConditionBase, Key
+from genai_kit.aws.client import get_resource
+
+
+# BatchWriteItem / BatchGetItem 의 요청당 최대 item 수
+BATCH_WRITE_LIMIT = 25
+BATCH_GET_LIMIT = 100
+
+_RETRYABLE_ERRORS = ('ProvisionedThroughputExceededException', 'ThrottlingException', 'RequestLimitExceeded')
+
+
+class BatchGetError(Exception):
+    """
+    batch_get 에서 retry 후에도 읽지 못한 key 가 있을 때 발생합니다.
+
+    Attributes:
+        items (list): 읽은 items (ids 순서)
+        errors (list): [(id, error)]
+    """
+    def __init__(self, items, errors):
+        super().__init__(f"batch_get failed for {len(errors)} keys: {errors[0][1]}")
+        self.items = items
+        self.errors = errors
 
 
 class DynamoDB:
-    def __init__(self, table_name):
-        self.db = boto3.resource('dynamodb')
+    def __init__(self, table_name, region=None, endpoint_url=None):
+        self.db = get_resource('dynamodb', region_name=region, endpoint_url=endpoint_url)
         self.name = table_name
         self.table = self.db.Table(table_name)
+        # resource 객체는 thread-safe 하지 않으므로 모든 요청은 resource 의 client 로 보냄
+        # (client 는 thread-safe 하고 resource 와 같은 Python <-> DynamoDB type 변환을 수행)
+        self.client = self.db.meta.client
+        # index 이름 -> (partition key, sort key)
+        self._index_keys = {}
         
-    def get_item(self, key):
-        response = self.table.get_item(Key={
+    def get_item(self, key, projection=None):
+        response = self.client.get_item(TableName=self.name, Key={
             'id': key
-        })
-        return json.loads(json.dumps(response.get('Item'), default=_default_serializer))
+        }, **(_projection(projection) if projection else {}))
+        return _from_dynamodb(response.get('Item'))
     
     def put_item(self, item: dict):
-        self.table.put_item(
-            Item=json.loads(json.dumps(item, default=_default_serializer), parse_float=Decimal)
+        self.client.put_item(
+            TableName=self.name,
+            Item=_to_dynamodb(item)
         )
 
     def update_item(self, id: str, updates: dict):
         update_expression = "SET " + ", ".join([f"#{k} = :{k}" for k in updates.keys()])
         expression_attribute_names = {f"#{k}": k for k in updates.keys()}
-        expression_attribute_values = {f":{k}": json.loads(
-            json.dumps(v, default=_default_serializer), 
-            parse_float=Decimal
-        ) for k, v in updates.items()}
+        expression_attribute_values = {f":{k}": _to_dynamodb(v) for k, v in updates.items()}
         
-        self.table.update_item(
+        self.client.update_item(
+            TableName=self.name,
             Key={"id": id},
             UpdateExpression=update_expression,
             ExpressionAttributeNames=expression_attribute_names,
             ExpressionAttributeValues=expression_attribute_values
         )
 
+    def upsert(self, id: str, updates: dict, if_not_exists: dict = None):
+        """
+        하나의 update_item 으로 item 을 생성하거나 갱신하고, 갱신된 전체 item 을 반환합니다.
+        get -> put/update -> get 대신 사용하면 round trip 이 1회이고 동시 쓰기에도 안전합니다.
+
+        Args:
+            updates (dict): 항상 덮어쓸 attribute
+            if_not_exists (dict): item 이 새로 만들어질 때(또는 attribute 가 없을 때)만 쓸 attribute (예: created_at)
+
+        Returns:
+            dict: 갱신 후의 item
+        """
+        if_not_exists = {k: v for k, v in (if_not_exists or {}).items() if k not in updates}
+        assignments = [f"#{k} = :{k}" for k in updates.keys()]
+        assignments += [f"#{k} = if_not_exists(#{k}, :{k})" for k in if_not_exists.keys()]
+        values = {**updates, **if_not_exists}
+
+        response = self.client.update_item(
+            TableName=self.name,
+            Key={"id": id},
+            UpdateExpression="SET " + ", ".join(assignments),
+            ExpressionAttributeNames={f"#{k}": k for k in values.keys()},
+            ExpressionAttributeValues={f":{k}": _to_dynamodb(v) for k, v in values.items()},
+            ReturnValues="ALL_NEW",
+        )
+        return _from_dynamodb(response.get('Attributes'))
+
     def delete_item(self, id):
-        self.table.delete_item(Key={"id": id})
+        self.client.delete_item(TableName=self.name, Key={"id": id})
         
     def scan_items(self, query):
-        return self.table.scan(**query)
+        return self.client.scan(TableName=self.name, **query)
+
+    def batch_put(self, items, max_workers: int = 4, max_retries: int = 8):
+        """
+        item 들을 25개 단위 BatchWriteItem 으로 나누어 병렬로 저장합니다.
+        같은 id 가 여러 번 있으면 마지막 item 만 저장합니다.
+
+        Returns:
+            dict: success, failed, errors [(id, error)], elapsed
+        """
+        requests = {}
+        for item in items:
+            item = _to_dynamodb(item)
+            requests[item['id']] = {'PutRequest': {'Item': item}}
+        return self._batch_write(list(requests.values()), max_workers, max_retries)
+
+    def batch_delete(self, ids, max_workers: int = 4, max_retries: int = 8):
+        """
+        id 들을 25개 단위 BatchWriteItem 으로 나누어 병렬로 삭제합니다.
+
+        Returns:
+            dict: success, failed, errors [(id, error)], elapsed
+        """
+        requests = [{'DeleteRequest': {'Key': {'id': id}}} for id in dict.fromkeys(ids)]
+        return self._batch_write(requests, max_workers, max_retries)
+
+    def batch_get(self, ids, projection=None, max_workers: int = 4, max_retries: int = 8):
+        """
+        id 들을 100개 단위 BatchGetItem 으로 나누어 병렬로 조회합니다.
+
+        Returns:
+            list: ids 순서의 items (없는 id 는 제외)
+
+        Raises:
+            BatchGetError: retry 후에도 읽지 못한 key 가 있을 때. 없는 id 와 구분할 수 있도록
+                읽은 items 와 실패한 [(id, error)] 를 함께 전달합니다.
+        """
+        ids = list(dict.fromkeys(ids))
+        keys = [{'id': id} for id in ids]
+        chunks = [keys[i:i + BATCH_GET_LIMIT] for i in range(0, len(keys), BATCH_GET_LIMIT)]
+
+        request = {}
+        if projection:
+            # 순서를 맞추기 위해 id 는 항상 포함
+            projection = list(dict.fromkeys(['id', *projection]))
+            request.update(_projection(projection))
+
+        found, errors = {}, []
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for items, unprocessed, error in executor.map(lambda chunk: self._get_chunk(chunk, request, max_retries), chunks):
+                errors.extend((_from_dynamodb(key)['id'], error) for key in unprocessed)
+                for item in _from_dynamodb(items):
+                    found[item['id']] = item
+
+        items = [found[id] for id in ids if id in found]
+        if errors:
+            raise BatchGetError(items, errors)
+        return items
+
+    def _batch_write(self, requests, max_workers: int, max_retries: int):
+        start = time.perf_counter()
+        chunks = [requests[i:i + BATCH_WRITE_LIMIT] for i in range(0, len(requests), BATCH_WRITE_LIMIT)]
+        result = {'success': 0, 'failed': 0, 'errors': []}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for chunk, (unprocessed, error) in zip(chunks, executor.map(lambda chunk: self._write_chunk(chunk, max_retries), chunks)):
+                result['success'] += len(chunk) - len(unprocessed)
+                result['failed'] += len(unprocessed)
+                result['errors'].extend((_request_id(request), error) for request in unprocessed)
+
+        result['elapsed'] = time.perf_counter() - start
+        if result['failed']:
+            print(f"batch write failed for {result['failed']} items: {result['errors'][0][1]}")
+        return result
+
+    def _write_chunk(self, requests, max_retries: int):
+        client = self.client
+        pending = requests
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(_backoff(attempt))
+            try:
+                response = client.batch_write_item(RequestItems={self.name: pending})
+            except ClientError as e:
+                if e.response['Error']['Code'] in _RETRYABLE_ERRORS and attempt < max_retries:
+                    continue
+                return pending, str(e)
+            # throttling 된 item 은 UnprocessedItems 로 돌아오므로 그것만 다시 요청
+            pending = response.get('UnprocessedItems', {}).get(self.name, [])
+            if not pending:
+                return [], None
+        return pending, f"still unprocessed after {max_retries} retries"
+
+    def _get_chunk(self, keys, request: dict, max_retries: int):
+        client = self.client
+        items, pending = [], keys
+        for attempt in range(max_retries + 1):
+            if attempt:
+                time.sleep(_backoff(attempt))
+            try:
+                response = client.batch_get_item(RequestItems={self.name: {'Keys': pending, **request}})
+            except ClientError as e:
+                if e.response['Error']['Code'] in _RETRYABLE_ERRORS and attempt < max_retries:
+                    continue
+                return items, pending, str(e)
+            items.extend(response.get('Responses', {}).get(self.name, []))
+            pending = response.get('UnprocessedKeys', {}).get(self.name, {}).get('Keys', [])
+            if not pending:
+                return items, [], None
+        return items, pending, f"still unprocessed after {max_retries} retries"
+
+    def parallel_scan(self, total_segments: int = 4, projection=None, filter=None, page_size: int = None,
+                      batch_format: str = None, batch_size: int = 1000):
+        """
+        table 전체를 total_segments 개의 segment 로 나누어 segment 별 thread 에서 병렬로 scan 합니다.
+        각 segment 의 pagination(LastEvaluatedKey) 을 따라가며 읽은 item 을 generator 로 흘려보냅니다.
+
+            for item in db.parallel_scan(total_segments=8, projection=['id', 'media_type']):
+                ...
+            for df in db.parallel_scan(batch_format='pandas', batch_size=5000):
+                ...
+
+        Args:
+            total_segments (int): segment (= worker thread) 수
+            projection (list): 가져올 attribute 목록. 없으면 전체
+            filter: boto3 Attr 조건 또는 {'media_type': 'image', 'model_type': ['a', 'b']} 형태의 dict
+            page_size (int): Scan 요청당 Limit
+            batch_format (str): None 이면 item 단위, 'pandas' / 'arrow' 이면 batch_size 개씩 DataFrame / Table
+            batch_size (int): batch_format 사용 시 batch 크기
+
+        Yields:
+            dict | pandas.DataFrame | pyarrow.Table (segment 간 순서는 보장하지 않음)
+        """
+        if batch_format not in (None, 'pandas', 'arrow'):
+            raise ValueError("batch_format must be None, 'pandas' or 'arrow'")
+
+        request = {'TableName': self.name, 'TotalSegments': total_segments}
+        if page_size:
+            request['Limit'] = page_size
+        if filter:
+            request['FilterExpression'] = _compile_filter(filter)
+        if projection:
+            request.update(_projection(projection))
+
+        items = self._scan_segments(request, total_segments)
+        if batch_format is None:
+            yield from items
+            return
+
+        to_batch = _batch_converter(batch_format)
+        batch = []
+        for item in items:
+            batch.append(item)
+            if len(batch) >= batch_size:
+                yield to_batch(batch)
+                batch = []
+        if batch:
+            yield to_batch(batch)
+
+    def _scan_segments(self, request: dict, total_segments: int):
+        # page 를 queue 로 전달하고, 소비자가 중간에 멈추면(stop) worker 도 종료
+        pages = queue.Queue(maxsize=total_segments * 2)
+        stop = threading.Event()
+        done = object()
+
+        def put(value):
+            while not stop.is_set():
+                try:
+                    pages.put(value, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def scan(segment):
+            client = self.client
+            kwargs = {**request, 'Segment': segment}
+            try:
+                while not stop.is_set():
+                    response = client.scan(**kwargs)
+                    if not put(response.get('Items', [])):
+                        return
+                    if 'LastEvaluatedKey' not in response:
+                        break
+                    kwargs['ExclusiveStartKey'] = response['LastEvaluatedKey']
+                put(done)
+            except Exception as e:
+                put(e)
+
+        workers = [threading.Thread(target=scan, args=(segment,), daemon=True) for segment in range(total_segments)]
+        for worker in workers:
+            worker.start()
+
+        try:
+            remaining = total_segments
+            while remaining:
+                page = pages.get()
+                if page is done:
+                    remaining -= 1
+                elif isinstance(page, Exception):
+                    raise page
+                else:
+                    yield from _from_dynamodb(page)
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join()
+
+    def query_page(self, index: str, partition, sort_range=None, limit: int = 50, cursor: str = None,
+                   projection=None, ascending: bool = False):
+        """
+        GSI 의 한 partition 을 sort key 순서로 page 단위 조회합니다. (기본: 내림차순, 최신순)
+
+        Args:
+            index (str): GSI 이름
+            partition: partition key 값 (예: 'image')
+            sort_range (tuple): (start, end) sort key 범위. 한쪽은 None 가능
+            limit (int): page 크기
+            cursor (str): 이전 호출이 반환한 cursor
+            projection (list): 가져올 attribute 목록. 없으면 전체
+
+        Returns:
+            (list, str): items, 다음 page 의 cursor (마지막 page 이면 None)
+        """
+        partition_key, sort_key = self.get_index_keys(index)
+
+        condition = Key(partition_key).eq(partition)
+        if sort_range:
+            start, end = sort_range
+            if start is not None and end is not None:
+                condition &= Key(sort_key).between(start, end)
+            elif start is not None:
+                condition &= Key(sort_key).gte(start)
+            elif end is not None:
+                condition &= Key(sort_key).lte(end)
+
+        kwargs = {
+            'IndexName': index,
+            'KeyConditionExpression': condition,
+            'ScanIndexForward': ascending,
+            'Limit': limit,
+        }
+        if cursor:
+            kwargs['ExclusiveStartKey'] = _decode_cursor(cursor)
+        if projection:
+            kwargs.update(_projection(projection))
+
+        response = self.client.query(TableName=self.name, **kwargs)
+        items = _from_dynamodb(response.get('Items', []))
+        return items, _encode_cursor(response.get('LastEvaluatedKey'))
+
+    def get_index_keys(self, index: str):
+        """
+        GSI 의 (partition key, sort key) 이름을 table 정보에서 읽어 반환합니다.
+        """
+        if index not in self._index_keys:
+            table = self.client.describe_table(TableName=self.name)['Table']
+            for gsi in table.get('GlobalSecondaryIndexes', []):
+                schema = {key['KeyType']: key['AttributeName'] for key in gsi['KeySchema']}
+                self._index_keys[gsi['IndexName']] = (schema['HASH'], schema.get('RANGE'))
+            if index not in self._index_keys:
+                raise ValueError(f"Index '{index}' not found on table '{self.name}'")
+        return self._index_keys[index]
 
 
 def _default_serializer(obj):
@@ -49,3 +371,107 @@ def _default_serializer(obj):
     if isinstance(obj, datetime):
         return obj.isoformat()
     raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
+def _to_dynamodb(value):
+    """
+    Python 값을 DynamoDB 에 저장 가능한 값으로 변환합니다. (float -> Decimal, datetime -> ISO 문자열)
+    json.dumps / json.loads(parse_float=Decimal) 왕복과 같은 결과를 한 번의 순회로 만듭니다.
+    """
+    kind = type(value)
+    if kind is dict:
+        return {(k if type(k) is str else _dynamodb_key(k)): _to_dynamodb(v) for k, v in value.items()}
+    if kind is list or kind is tuple:
+        return [_to_dynamodb(v) for v in value]
+    if kind is float:
+        # json 과 같이 repr 로 변환해야 0.1 -> Decimal('0.1') 이 됨
+        return Decimal(repr(value))
+    if kind is str or kind is int or kind is bool or value is None:
+        return value
+    if kind is Decimal:
+        return Decimal(repr(float(value)))
+    if isinstance(value, datetime):
+        return value.isoformat()
+    # Enum, dict/list subclass 등 드문 type 은 기존 json 왕복으로 처리
+    return json.loads(json.dumps(value, default=_default_serializer), parse_float=Decimal)
+
+
+def _dynamodb_key(key) -> str:
+    # json 과 같은 key 변환: str 하위 type (BedrockModel 등) 은 값 그대로, 그 외 (int, float, bool, None) 는 JSON 표기
+    if isinstance(key, str):
+        return str.__str__(key)
+    return json.dumps(key)
+
+
+def _from_dynamodb(value):
+    """
+    DynamoDB 에서 읽은 값을 JSON 호환 Python 값으로 변환합니다. (Decimal -> float)
+    """
+    kind = type(value)
+    if kind is dict:
+        return {k: _from_dynamodb(v) for k, v in value.items()}
+    if kind is list:
+        return [_from_dynamodb(v) for v in value]
+    if kind is Decimal:
+        return float(value)
+    if kind is str or kind is int or kind is bool or value is None:
+        return value
+    return json.loads(json.dumps(value, default=_default_serializer))
+
+
+def _projection(projection):
+    """
+    attribute 목록을 ProjectionExpression 으로 변환합니다. 'details.status' 같은 중첩 경로도 지원합니다.
+    """
+    placeholders, paths = {}, []
+    for path in projection:
+        paths.append(".".join(placeholders.setdefault(name, f"#p{len(placeholders)}") for name in path.split('.')))
+    return {
+        'ProjectionExpression': ", ".join(paths),
+        'ExpressionAttributeNames': {placeholder: name for name, placeholder in placeholders.items()},
+    }
+
+def _compile_filter(filter):
+    """
+    dict filter 를 boto3 조건으로 변환합니다. list 값은 IN, 그 외는 equals 이며 모두 AND 로 결합합니다.
+    """
+    if isinstance(filter, ConditionBase):
+        return filter
+
+    condition = None
+    for field, value in filter.items():
+        if isinstance(value, (list, tuple, set)):
+            clause = Attr(field).is_in([_to_dynamodb(v) for v in value])
+        else:
+            clause = Attr(field).eq(_to_dynamodb(value))
+        condition = clause if condition is None else condition & clause
+    return condition
+
+
+def _batch_converter(batch_format: str):
+    if batch_format == 'pandas':
+        import pandas as pd
+        return pd.DataFrame.from_records
+    import pyarrow as pa
+    return pa.Table.from_pylist
+
+
+def _backoff(attempt: int, base: float = 0.05, cap: float = 5.0) -> float:
+    # full jitter: 동시에 throttling 된 chunk 들이 같은 시점에 재시도하지 않도록
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def _request_id(request: dict):
+    item = request['PutRequest']['Item'] if 'PutRequest' in request else request['DeleteRequest']['Key']
+    return item['id']
+
+
+def _encode_cursor(last_evaluated_key):
+    if not last_evaluated_key:
+        return None
+    data = json.dumps(last_evaluated_key, default=_default_serializer).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii')
+
+
+def _decode_cursor(cursor: str):
+    return json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')), parse_float=Decimal)
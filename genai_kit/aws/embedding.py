@@ -1,13 +1,51 @@
-import boto3
+import os
 import json
+import threading
+import numpy as np
+from typing import Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from botocore.config import Config
 from langchain_community.embeddings import BedrockEmbeddings
 
+from genai_kit.aws.bedrock import BedrockModel
+from genai_kit.aws.client import get_client
+from genai_kit.utils.cache import make_cache_key
+from genai_kit.utils.embedding_store import EmbeddingStore
+
 
 class BedrockEmbedding():
-    def __init__(self, region='us-west-2'):
+    # Cohere embed 는 요청 하나에 최대 96 개의 text 를 받음
+    COHERE_BATCH_SIZE = 96
+
+    # Titan Text Embeddings v2 에서 지원하는 출력 차원
+    TITAN_V2_DIMENSIONS = (256, 512, 1024)
+    # Titan Multimodal Embeddings (기본 출력 길이) / Cohere embed 의 출력 차원
+    MULTIMODAL_DIMENSIONS = 1024
+    COHERE_DIMENSIONS = 1024
+
+    def __init__(self,
+                 region='us-west-2',
+                 cache=None,
+                 store=None,
+                 textEmbeddingId=BedrockModel.TITAN_TEXT_EMBEDDING,
+                 dimensions: int = 1024,
+                 normalize: bool = True):
+        if dimensions not in self.TITAN_V2_DIMENSIONS:
+            raise ValueError(f"dimensions must be one of {self.TITAN_V2_DIMENSIONS}")
+
         self.region = region
-        self.bedrock = boto3.client(
+        # Titan v2 text embedding 출력 차원 / 정규화 여부
+        self.dimensions = dimensions
+        self.normalize = normalize
+        # opt-in embedding cache (genai_kit.utils.cache.MemoryCache / SQLiteCache)
+        self.cache = cache
+        # opt-in persistent vector store
+        # - directory 경로: model / 차원별로 {store}/{model}-{dim} 아래 EmbeddingStore 를 따로 생성
+        # - EmbeddingStore: store 하나는 차원이 고정이므로 multimodal 과 text embedding 의 차원이 같을 때만 사용 가능
+        self.store = store
+        self._stores = {}
+        self._stores_lock = threading.Lock()
+        self.bedrock = get_client(
             service_name = 'bedrock-runtime',
             region_name = self.region,
             config = Config(
@@ -24,49 +62,214 @@ class BedrockEmbedding():
             model_id = self.multimodalId
         )
 
-        self.textEmbeddingId = 'amazon.titan-embed-text-v2:0'
+        self.textEmbeddingId = textEmbeddingId
         self.textmodal = BedrockEmbeddings(
             client=self.bedrock,
             region_name = self.region,
-            model_id = self.textEmbeddingId
+            model_id = self.textEmbeddingId,
+            model_kwargs = self._text_body() or None,
         )
+
+        if isinstance(store, EmbeddingStore):
+            dims = {self.MULTIMODAL_DIMENSIONS, self._text_dimensions(), store.dim} - {None}
+            if len(dims) > 1:
+                raise ValueError(
+                    f"EmbeddingStore holds a single dimension but embeddings would be {sorted(dims)}; "
+                    "pass a directory path to keep a store per model"
+                )
     
     '''
     Multimodal Embedding
     '''
     def embedding_multimodal(self, text=None, image=None):
+        body = _multimodal_body(text, image)
+        return _to_list(self._invoke_embedding(self.multimodalId, body))
+
+
+    '''
+    Text Embedding
+    '''
+    def embedding_text(self, text=None, input_type='search_document'):
+        if self._is_cohere():
+            embeddings = self._invoke_cohere([text], input_type=input_type)
+            return _to_list(embeddings[0]) if embeddings else []
+
+        return _to_list(self._invoke_embedding(self.textEmbeddingId, self._text_body(text)))
+
+    '''
+    Batch Embedding
+    '''
+    def embed_multimodal_batch(self, inputs: Iterable[Tuple[Optional[str], Optional[str]]], max_workers: int = 10):
+        '''
+        Args:
+            inputs: (text, image) 쌍 목록. image 는 base64 문자열
+            max_workers (int): 동시 요청 수
+
+        Returns:
+            (np.ndarray, np.ndarray): 입력 순서의 (N, dim) float32 행렬, 실패한 행의 mask (N,)
+        '''
+        inputs = list(inputs)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            embeddings = list(executor.map(
+                lambda x: self._invoke_embedding(self.multimodalId, _multimodal_body(*x)), inputs
+            ))
+        return _to_matrix(embeddings)
+
+    def embed_text_batch(self, texts: Iterable[str], max_workers: int = 10, input_type='search_document'):
+        '''
+        Cohere 모델이 선택된 경우 최대 96 개씩 묶어서 요청합니다.
+
+        Returns:
+            (np.ndarray, np.ndarray): 입력 순서의 (N, dim) float32 행렬, 실패한 행의 mask (N,)
+        '''
+        texts = list(texts)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if self._is_cohere():
+                size = self.COHERE_BATCH_SIZE
+                chunks = [texts[i:i + size] for i in range(0, len(texts), size)]
+                results = executor.map(lambda chunk: self._invoke_cohere(chunk, input_type=input_type), chunks)
+                embeddings = []
+                for chunk, result in zip(chunks, results):
+                    embeddings.extend(result if len(result) == len(chunk) else [[]] * len(chunk))
+            else:
+                embeddings = list(executor.map(
+                    lambda text: self._invoke_embedding(self.textEmbeddingId, self._text_body(text)), texts
+                ))
+        return _to_matrix(embeddings)
+
+    def _text_body(self, text=None):
         body = dict()
         if text is not None: body['inputText'] = text
-        if image is not None: body['inputImage'] = image
+        if _model_id(self.textEmbeddingId) == BedrockModel.TITAN_TEXT_EMBEDDING.value:
+            body['dimensions'] = self.dimensions
+            body['normalize'] = self.normalize
+        return body
+
+    def _text_dimensions(self) -> Optional[int]:
+        # 알 수 없는 model 이면 None (EmbeddingStore 가 첫 vector 로 결정)
+        if _model_id(self.textEmbeddingId) == BedrockModel.TITAN_TEXT_EMBEDDING.value:
+            return self.dimensions
+        if self._is_cohere():
+            return self.COHERE_DIMENSIONS
+        return None
+
+    def _is_cohere(self):
+        return _model_id(self.textEmbeddingId).startswith('cohere.')
+
+    def _invoke_cohere(self, texts: List[str], input_type='search_document'):
+        # text 별로 cache / store 를 조회하고, 없는 text 만 모아서 요청
+        keys = [self._key(self.textEmbeddingId, _cohere_body([text], input_type)) for text in texts]
+        embeddings = [self._lookup(self.textEmbeddingId, key) for key in keys]
+        missing = [i for i, e in enumerate(embeddings) if e is None]
+        if not missing:
+            return embeddings
 
         try:
             res = self.bedrock.invoke_model(
-                body=json.dumps(body),
-                modelId=self.multimodalId,
+                body=json.dumps(_cohere_body([texts[i] for i in missing], input_type)),
+                modelId=self.textEmbeddingId,
                 accept="application/json",
                 contentType="application/json"
             )
-            return json.loads(res.get("body").read()).get("embedding")
+            result = json.loads(res.get("body").read()).get("embeddings", [])
+            if len(result) != len(missing):
+                return []
+            for i, embedding in zip(missing, result):
+                embeddings[i] = embedding
+                self._save(self.textEmbeddingId, keys[i], embedding)
+            return embeddings
         except Exception as e:
             print(e)
             return []
 
+    def _invoke_embedding(self, modelId: str, body: dict):
+        key = self._key(modelId, body)
+        if (found := self._lookup(modelId, key)) is not None:
+            return found
 
-    '''
-    Text Embedding
-    '''
-    def embedding_text(self, text=None):
-        body = dict()
-        if text is not None: body['inputText'] = text
-        
         try:
             res = self.bedrock.invoke_model(
                 body=json.dumps(body),
-                modelId=self.textEmbeddingId,
+                modelId=modelId,
                 accept="application/json",
                 contentType="application/json"
             )
-            return json.loads(res.get("body").read()).get("embedding")
+            embedding = json.loads(res.get("body").read()).get("embedding")
+            self._save(modelId, key, embedding)
+            return embedding
         except Exception as e:
             print(e)
             return []
+
+    '''
+    Embedding cache / store
+    '''
+    def _key(self, modelId: str, body: dict):
+        if self.cache is None and self.store is None:
+            return None
+        return make_cache_key('embedding', modelId, body)
+
+    def _get_store(self, modelId: str):
+        if not isinstance(self.store, (str, os.PathLike)):
+            return self.store
+        with self._stores_lock:
+            if modelId not in self._stores:
+                dim = self.MULTIMODAL_DIMENSIONS if modelId == self.multimodalId else self._text_dimensions()
+                name = _model_id(modelId).replace(':', '_')
+                path = os.path.join(self.store, f'{name}-{dim}' if dim else name)
+                self._stores[modelId] = EmbeddingStore(path, dim=dim)
+            return self._stores[modelId]
+
+    def _lookup(self, modelId: str, key):
+        if key is None:
+            return None
+        if (store := self._get_store(modelId)) is not None and (vector := store.get(key)) is not None:
+            return vector
+        if self.cache is not None:
+            return self.cache.get(key)
+        return None
+
+    def _save(self, modelId: str, key, embedding):
+        if key is None or not embedding:
+            return
+        if self.cache is not None:
+            self.cache.set(key, embedding)
+        if (store := self._get_store(modelId)) is not None:
+            try:
+                store.put(key, embedding)
+            except Exception as e:
+                print(e)
+
+
+def _model_id(model) -> str:
+    # Python 3.11 부터 str(BedrockModel.X) 는 'BedrockModel.X' 이므로 enum 이면 value 를 사용
+    return getattr(model, 'value', model)
+
+
+def _multimodal_body(text=None, image=None):
+    body = dict()
+    if text is not None: body['inputText'] = text
+    if image is not None: body['inputImage'] = image
+    return body
+
+
+def _cohere_body(texts: List[str], input_type='search_document'):
+    return {
+        'texts': texts,
+        'input_type': input_type,
+        'truncate': 'END',
+    }
+
+
+def _to_list(embedding):
+    return embedding.tolist() if isinstance(embedding, np.ndarray) else embedding
+
+
+def _to_matrix(embeddings: List[List[float]]):
+    failed = np.array([e is None or len(e) == 0 for e in embeddings], dtype=bool)
+    dim = next((len(e) for e, f in zip(embeddings, failed) if not f), 0)
+    matrix = np.zeros((len(embeddings), dim), dtype=np.float32)
+    for i, e in enumerate(embeddings):
+        if not failed[i]:
+            matrix[i] = e
+    return matrix, failed
@@ -1,25 +1,40 @@
+import os
 import json
+import time
+import random
+import threading
 
-from typing import List
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Tuple
 from requests_aws4auth import AWS4Auth
-from opensearchpy import OpenSearch, RequestsHttpConnection
+from opensearchpy import OpenSearch, RequestsHttpConnection, helpers
 from langchain.vectorstores import OpenSearchVectorSearch
 
 from genai_kit.aws.embedding import BedrockEmbedding
+from genai_kit.utils.cache import make_cache_key
+
+
+# (endpoint, index) 별 cache generation. 쓰기가 발생하면 증가시켜 이전 검색 결과를 무효화
+_generations = {}
+_generations_lock = threading.Lock()
 
 
 class OpenSearchWrapper():
-    def __init__(self, endpoint, index, region='us-west-2'):
+    def __init__(self, endpoint, index, region='us-west-2', cache=None, client=None):
         self.region = region
         self.endpoint = endpoint
         self.index = index
+        # opt-in search result cache (genai_kit.utils.cache.MemoryCache(max_items, ttl))
+        self.cache = cache
 
         self.awsauth = AWS4Auth(
             self.region,
             'es'
         )
 
-        self.client = OpenSearch(
+        # client 를 주입하면 (예: local OpenSearch container) AWS 인증 client 대신 사용
+        self.client = client or OpenSearch(
             hosts=[{'host': self.endpoint.replace('https://', ''), 'port': 443}],
             http_auth=self.awsauth,
             use_ssl=True,
@@ -34,21 +49,17 @@ class OpenSearchWrapper():
     '''
     def create_index(self,
                      index_path: str = 'os-index-schema.json',
-                     index_body: dict = None):
+                     index_body: dict = None,
+                     dimension: int = None):
         
-        if index_path:
-            # load index schema
-            with open(index_path, 'r') as f:
-                index_body = json.load(f)
-
-        if not index_body:
-            raise
+        index_body = _load_schema(index_path or index_body, dimension)
 
         # delete index if it exist
         self.delete_index()
 
         # create index
         self.client.indices.create(index=self.index, body=index_body)
+        self.invalidate_cache()
         print(f'create index: {self.index}')
 
         # get index info
@@ -60,9 +71,111 @@ class OpenSearchWrapper():
 
 
     def delete_index(self):
+        # reindex 이후 self.index 는 alias 이므로 alias 가 가리키는 실제 index 들을 삭제 (alias 도 함께 제거됨)
+        indices = self._concrete_indices()
+        for index in indices:
+            self.client.indices.delete(index=index, ignore=[404])
+            print(f'delete index: {index}')
+        if indices:
+            self.invalidate_cache()
+
+    def _concrete_indices(self) -> List[str]:
+        # self.index 가 alias 이면 alias 가 가리키는 index 목록, 실제 index 이면 [self.index]
+        if self.client.indices.exists_alias(name=self.index):
+            return list(self.client.indices.get_alias(name=self.index).keys())
         if self.client.indices.exists(index=self.index):
-            self.client.indices.delete(index=self.index, ignore=[400, 404])
-            print(f'delete index: {self.index}')
+            return [self.index]
+        return []
+
+    '''
+    Blue/Green Reindex
+    '''
+    def reindex(self,
+                new_schema,
+                source_docs: Iterable[Tuple[str, dict]] = None,
+                validation_queries: List[dict] = None,
+                dimension: int = None,
+                chunk_size: int = 500,
+                max_workers: int = 4,
+                keep_old: bool = False):
+        '''
+        self.index 를 alias 로 사용하여 무중단으로 index 를 교체합니다.
+
+        1. 새 schema 로 versioned index ({index}-{timestamp}) 생성
+        2. source_docs 를 bulk_upsert 로 적재 (없으면 현재 index 에서 _reindex API 로 복사)
+        3. 문서 수와 validation_queries 결과 확인
+        4. alias 를 새 index 로 원자적으로 교체한 뒤 이전 index 삭제
+
+        검증에 실패하면 새 index 를 삭제하고 None 을 반환합니다. (기존 index 는 그대로 서비스)
+
+        Args:
+            new_schema: index schema (dict) 또는 schema json 파일 경로
+            source_docs: (id, body) 목록. id 는 중복되지 않아야 문서 수 검증이 맞음
+            validation_queries: 새 index 에서 결과가 1 건 이상 나와야 하는 search body 목록
+
+        Returns:
+            str: 새 index 이름
+        '''
+        alias = self.index
+        new_index = f"{alias}-{time.strftime('%Y%m%d%H%M%S')}"
+
+        old_indices = self._concrete_indices()
+        # 기존 create_index 로 만든 index 는 alias 가 아닌 실제 index 이름을 사용 중
+        is_concrete = old_indices == [alias]
+        old_count = self.client.count(index=alias)['count'] if old_indices else 0
+
+        self.client.indices.create(index=new_index, body=_load_schema(new_schema, dimension))
+        print(f'create index: {new_index}')
+
+        try:
+            if source_docs is not None:
+                stats = self.bulk_upsert(source_docs, chunk_size=chunk_size, max_workers=max_workers, index=new_index)
+                if stats['failed']:
+                    raise ValueError(f"{stats['failed']} documents failed to index")
+                expected = stats['success']
+            else:
+                if not old_indices:
+                    raise ValueError(f"No source_docs and no existing index '{alias}' to copy from")
+                self.client.reindex(
+                    body={"source": {"index": alias}, "dest": {"index": new_index}},
+                    params={"wait_for_completion": "true", "refresh": "true", "slices": "auto"},
+                )
+                expected = old_count
+
+            self._validate_index(new_index, expected, validation_queries or [])
+        except Exception as e:
+            print(f'reindex failed, keep {alias}: {e}')
+            self.client.indices.delete(index=new_index, ignore=[400, 404])
+            return None
+
+        # alias 추가와 이전 index 제거를 하나의 요청으로 처리
+        actions = [{"add": {"index": new_index, "alias": alias}}]
+        if is_concrete:
+            # 같은 이름의 alias 를 만들려면 기존 index 를 같은 요청에서 삭제해야 함 (keep_old 적용 불가)
+            actions.insert(0, {"remove_index": {"index": alias}})
+        else:
+            actions = [{"remove": {"index": index, "alias": alias}} for index in old_indices] + actions
+        self.client.indices.update_aliases(body={"actions": actions})
+        self.invalidate_cache()
+        print(f'alias {alias} -> {new_index}')
+
+        if not keep_old and not is_concrete:
+            for index in old_indices:
+                self.client.indices.delete(index=index, ignore=[400, 404])
+                print(f'delete index: {index}')
+
+        return new_index
+
+    def _validate_index(self, index: str, expected: int, validation_queries: List[dict]):
+        count = self.client.count(index=index)['count']
+        if count != expected:
+            raise ValueError(f"Document count mismatch: expected {expected}, got {count}")
+
+        for body in validation_queries:
+            hits = self.client.search(index=index, body=body)['hits']['hits']
+            if not hits:
+                raise ValueError(f"Validation query returned no hits: {json.dumps(body)[:200]}")
+
 
     '''
     Update/GET/Delete Document
@@ -74,6 +187,93 @@ class OpenSearchWrapper():
             body={ "doc": body, "doc_as_upsert": True},
             refresh=True
         )
+        self.invalidate_cache()
+
+    def bulk_upsert(self,
+                    docs: Iterable[Tuple[str, dict]],
+                    chunk_size: int = 500,
+                    max_workers: int = 4,
+                    max_retries: int = 5,
+                    index: str = None):
+        '''
+        여러 문서를 bulk API 로 upsert 합니다.
+        적재 중에는 refresh 를 끄고, 끝나면 이전 refresh_interval 로 되돌린 뒤 한 번 refresh 합니다.
+        429 (too many requests) 로 거절된 문서만 backoff 후 다시 요청합니다.
+
+        Args:
+            docs: (id, body) 목록
+            chunk_size (int): bulk 요청 하나에 담을 문서 수
+            max_workers (int): 동시 bulk 요청 수
+
+        Returns:
+            dict: {'success', 'failed', 'errors', 'elapsed', 'docs_per_sec'}
+        '''
+        index = index or self.index
+        stats = {'success': 0, 'failed': 0, 'errors': []}
+        start = time.perf_counter()
+
+        settings = self.client.indices.get_settings(index=index, name='index.refresh_interval')
+        # alias 로 호출한 경우에도 실제 index 의 설정을 읽음
+        previous = next(iter(settings.values()), {}).get('settings', {}).get('index', {}).get('refresh_interval')
+        self.client.indices.put_settings(index=index, body={'index': {'refresh_interval': '-1'}})
+
+        try:
+            pending = docs
+            for attempt in range(max_retries + 1):
+                pending = self._bulk_upsert_once(index, pending, chunk_size, max_workers, stats,
+                                                 retry_throttled=attempt < max_retries)
+                if not pending:
+                    break
+                time.sleep(min(2 ** attempt, 60) * (0.5 + random.random() / 2))
+        finally:
+            # previous 가 None 이면 cluster 기본값으로 되돌림
+            self.client.indices.put_settings(index=index, body={'index': {'refresh_interval': previous}})
+            self.client.indices.refresh(index=index)
+            self.invalidate_cache(index)
+
+        stats['elapsed'] = time.perf_counter() - start
+        stats['docs_per_sec'] = stats['success'] / stats['elapsed'] if stats['elapsed'] else 0.0
+        print(f"bulk upsert {index}: {stats['success']} ok, {stats['failed']} failed, "
+              f"{stats['elapsed']:.1f}s ({stats['docs_per_sec']:.0f} docs/s)")
+        return stats
+
+    def _bulk_upsert_once(self, index, docs, chunk_size, max_workers, stats, retry_throttled):
+        # parallel_bulk 는 입력 순서대로 결과를 돌려주므로, 보낸 문서를 queue 에 두고 결과와 짝지음
+        sent = deque()
+
+        def actions():
+            for id, body in docs:
+                sent.append((id, body))
+                yield {
+                    '_op_type': 'update',
+                    '_index': index,
+                    '_id': id,
+                    'doc': body,
+                    'doc_as_upsert': True,
+                }
+
+        throttled = []
+        results = helpers.parallel_bulk(
+            self.client,
+            actions(),
+            thread_count=max_workers,
+            chunk_size=chunk_size,
+            raise_on_error=False,
+            raise_on_exception=False,
+        )
+        for ok, item in results:
+            doc = sent.popleft()
+            if ok:
+                stats['success'] += 1
+                continue
+
+            result = item.get('update', item)
+            if result.get('status') == 429 and retry_throttled:
+                throttled.append(doc)
+            else:
+                stats['failed'] += 1
+                stats['errors'].append(result)
+        return throttled
 
     def get_doc(self, id: str):
         return self.client.get(
@@ -96,20 +296,126 @@ class OpenSearchWrapper():
         })
 
         try:
-            res = self.client.search(
-                index=self.index,
-                body=body,
-            )
-            return res['hits']['hits']
+            return self._cached_search('search', body)
         except Exception as e:
             print(e)
             return []
         
 
+    '''
+    Export (point-in-time + search_after)
+    '''
+    def iter_documents(self,
+                       query: dict = None,
+                       fields: List[str] = None,
+                       page_size: int = 1000,
+                       slice_id: int = None,
+                       max_slices: int = None,
+                       sort: List = None,
+                       pit_id: str = None,
+                       keep_alive: str = '5m'):
+        '''
+        index 의 모든 문서를 page 단위로 읽는 generator. 메모리는 page 하나 크기로 유지됩니다.
+
+        point-in-time 을 사용하므로 export 도중의 쓰기는 결과에 영향을 주지 않으며,
+        slice_id / max_slices 를 주면 같은 pit_id 를 공유하는 여러 worker 가 나누어 읽을 수 있습니다.
+
+        Args:
+            query: 기본값 match_all
+            fields: 반환할 _source field 목록. 없으면 vector_field 를 포함한 전체
+            sort: search_after 에 사용할 유일한 정렬 기준. 기본값 _id
+                (문서 수가 많으면 keyword 형식의 유일한 field, 예: [{'metadata.id': 'asc'}] 가 더 효율적)
+            pit_id: 공유할 point-in-time id. 없으면 생성 후 종료 시 삭제
+
+        Yields:
+            dict: {'_id', '_source'}
+        '''
+        own_pit = pit_id is None
+        if own_pit:
+            pit_id = self.create_pit(keep_alive)
+
+        body = {
+            "size": page_size,
+            "query": query or {"match_all": {}},
+            "pit": {"id": pit_id, "keep_alive": keep_alive},
+            "sort": sort or [{"_id": "asc"}],
+        }
+        if fields:
+            body["_source"] = {"includes": fields}
+        if max_slices and max_slices > 1:
+            body["slice"] = {"id": slice_id or 0, "max": max_slices}
+
+        try:
+            while True:
+                hits = self.client.search(body=body)['hits']['hits']
+                for hit in hits:
+                    yield {'_id': hit['_id'], '_source': hit.get('_source', {})}
+                if len(hits) < page_size:
+                    break
+                body["search_after"] = hits[-1]['sort']
+        finally:
+            if own_pit:
+                self.delete_pit(pit_id)
+
+    def export_documents(self,
+                         path: str,
+                         format: str = 'jsonl',
+                         query: dict = None,
+                         fields: List[str] = None,
+                         page_size: int = 1000,
+                         max_slices: int = 1,
+                         sort: List = None):
+        '''
+        index 를 JSONL 또는 Parquet 파일로 내보냅니다. (Parquet 은 pyarrow 필요)
+        Parquet 은 _id, _source (JSON 문자열) 두 column 으로 저장하므로 문서마다 field 가 달라도 빠지는 값이 없습니다.
+        max_slices > 1 이면 하나의 point-in-time 을 slice 별 thread 가 나누어 읽고
+        path 디렉터리 아래 part-00000.jsonl ... 로 기록합니다.
+
+        Returns:
+            dict: {'documents', 'files', 'elapsed', 'docs_per_sec'}
+        '''
+        if format not in ('jsonl', 'parquet'):
+            raise ValueError("format must be 'jsonl' or 'parquet'")
+
+        start = time.perf_counter()
+        if max_slices > 1:
+            os.makedirs(path, exist_ok=True)
+            files = [os.path.join(path, f'part-{i:05d}.{format}') for i in range(max_slices)]
+        else:
+            files = [path]
+
+        writer = _write_jsonl if format == 'jsonl' else _write_parquet
+        pit_id = self.create_pit()
+        try:
+            def export_slice(slice_id):
+                docs = self.iter_documents(query, fields, page_size, slice_id, max_slices, sort, pit_id)
+                return writer(files[slice_id], docs, page_size)
+
+            with ThreadPoolExecutor(max_workers=max_slices) as executor:
+                counts = list(executor.map(export_slice, range(max_slices)))
+        finally:
+            self.delete_pit(pit_id)
+
+        stats = {'documents': sum(counts), 'files': files, 'elapsed': time.perf_counter() - start}
+        stats['docs_per_sec'] = stats['documents'] / stats['elapsed'] if stats['elapsed'] else 0.0
+        print(f"export {self.index}: {stats['documents']} documents, "
+              f"{stats['elapsed']:.1f}s ({stats['docs_per_sec']:.0f} docs/s)")
+        return stats
+
+    def create_pit(self, keep_alive: str = '5m') -> str:
+        return self.client.create_pit(index=self.index, params={'keep_alive': keep_alive})['pit_id']
+
+    def delete_pit(self, pit_id: str):
+        try:
+            self.client.delete_pit(body={'pit_id': [pit_id]})
+        except Exception as e:
+            print(e)
+
+
     '''
     Vector Store
     '''
-    def get_vector_store(self, is_multimodal=True):
+    def get_vector_store(self, is_multimodal=True, space_type='l2'):
         embedding = BedrockEmbedding().textmodal
         if is_multimodal:
             embedding = BedrockEmbedding().multimodal
@@ -124,31 +430,166 @@ class OpenSearchWrapper():
             text_field="text",
             vector_field="vector_field",
             engine="faiss",
-            space_type="l2",
+            space_type=space_type,
             timeout=60
         )
     
 
-    def vector_search(self, vector: List = [], k: int = 3):
-        res = self.client.search(
+    def vector_search(self, vector: List = [], k: int = 3, filter: dict = None):
+        '''
+        Args:
+            filter (dict): {'metadata.category': 'TABLE', 'product_type': ['CHAIR', 'SOFA'], 'price': {'lte': 100}}
+                knn clause 안의 efficient filter 로 전달되어, engine 이 filter 결과 크기에 따라
+                exact / approximate 검색을 선택합니다. (faiss 2.9+ / lucene engine)
+        '''
+        knn = {
+            "vector": vector,
+            "k": k,
+        }
+        if filter:
+            knn["filter"] = compile_filter(filter)
+
+        return self._cached_search('vector_search', {
+            # size 를 주지 않으면 k 와 상관없이 최대 10 개만 반환됨
+            "size": k,
+            "query": {
+                "knn": {
+                    "vector_field": knn
+                }
+            },
+            "_source": {
+                "excludes": ["vector_field"]
+            },
+        })
+
+
+    '''
+    Hybrid Search (BM25 + kNN)
+    '''
+    def hybrid_search(self,
+                      text: str,
+                      vector: List,
+                      k: int = 10,
+                      weights: Tuple[float, float] = (0.3, 0.7),
+                      fusion: str = 'minmax',
+                      text_fields: List[str] = ['text'],
+                      fields: List[str] = None,
+                      filter: dict = None,
+                      pipeline: str = None):
+        '''
+        lexical (multi_match) 과 kNN 결과를 하나의 요청으로 가져와 점수를 합칩니다.
+
+        - pipeline 이 주어지면 normalization-processor 가 설정된 search pipeline 으로 hybrid query 를 실행
+          (create_hybrid_pipeline 참고, OpenSearch 2.10+)
+        - 그렇지 않으면 두 query 를 하나의 msearch 로 보내고 client 에서 fusion
+
+        Args:
+            weights: (lexical, vector) 가중치
+            fusion (str): 'minmax' (min-max 정규화 후 가중합) 또는 'rrf' (reciprocal rank fusion)
+            fields: 반환할 _source field 목록. 없으면 vector_field 를 제외한 전체
+            filter (dict): 두 query 에 모두 적용할 filter (vector_search 참고)
+
+        Returns:
+            list: 합산 점수 순의 hits [{'_id', '_score', '_source'}]
+        '''
+        if fusion not in ('minmax', 'rrf'):
+            raise ValueError("fusion must be 'minmax' or 'rrf'")
+
+        source = {"includes": fields} if fields else {"excludes": ["vector_field"]}
+        lexical = {"multi_match": {"query": text, "fields": text_fields}}
+        knn = {"knn": {"vector_field": {"vector": vector, "k": k}}}
+        if filter:
+            compiled = compile_filter(filter)
+            lexical = {"bool": {"must": [lexical], "filter": compiled["bool"]["filter"]}}
+            knn["knn"]["vector_field"]["filter"] = compiled
+
+        if pipeline:
+            res = self.client.search(
                 index=self.index,
                 body={
-                    "query": {
-                        "knn": {
-                            "vector_field": {
-                                "vector": vector,
-                                "k": k,
-                            }
-                        }
-                    },
-                    "_source": {
-                        "excludes": ["vector_field"]
-                    },
-                }
+                    "size": k,
+                    "query": {"hybrid": {"queries": [lexical, knn]}},
+                    "_source": source,
+                },
+                params={"search_pipeline": pipeline},
             )
-        return res['hits']['hits']
+            return res['hits']['hits']
+
+        # fusion 후 순위가 바뀔 수 있으므로 각 query 에서 k 보다 넉넉하게 가져옴
+        size = k * 2
+        knn['knn']['vector_field']['k'] = size
+        body = []
+        for query in (lexical, knn):
+            body.append({"index": self.index})
+            body.append({"size": size, "query": query, "_source": source})
+
+        res = self.client.msearch(body=body)
+        results = []
+        for response in res['responses']:
+            if 'error' in response:
+                print(response['error'])
+                results.append([])
+            else:
+                results.append(response['hits']['hits'])
+
+        if fusion == 'rrf':
+            return _rrf_fusion(results, weights)[:k]
+        return _minmax_fusion(results, weights)[:k]
+
+    def create_hybrid_pipeline(self,
+                               name: str,
+                               weights: Tuple[float, float] = (0.3, 0.7),
+                               technique: str = 'min_max'):
+        '''
+        hybrid query 결과를 정규화/가중합하는 search pipeline 을 생성합니다.
+        '''
+        self.client.transport.perform_request(
+            'PUT',
+            f'/_search/pipeline/{name}',
+            body={
+                "description": "hybrid search normalization",
+                "phase_results_processors": [{
+                    "normalization-processor": {
+                        "normalization": {"technique": technique},
+                        "combination": {
+                            "technique": "arithmetic_mean",
+                            "parameters": {"weights": list(weights)},
+                        },
+                    }
+                }],
+            },
+        )
+        print(f'create search pipeline: {name}')
+
+
+    '''
+    Search result cache
+    '''
+    def invalidate_cache(self, index: str = None):
+        '''
+        index 의 cache generation 을 증가시켜 이전에 cache 된 검색 결과를 더 이상 사용하지 않도록 합니다.
+        같은 process 의 모든 OpenSearchWrapper 에 적용됩니다.
+        '''
+        key = (self.endpoint, index or self.index)
+        with _generations_lock:
+            _generations[key] = _generations.get(key, 0) + 1
+
+    def _cached_search(self, api: str, body: dict):
+        if self.cache is None:
+            return self.client.search(index=self.index, body=body)['hits']['hits']
+
+        # 검색 전에 generation 을 읽어서, 검색 도중 쓰기가 발생하면 이 결과는 다시 조회되지 않음
+        generation = _generations.get((self.endpoint, self.index), 0)
+        key = make_cache_key(api, self.endpoint, self.index, generation, body)
+        if (cached := self.cache.get(key)) is not None:
+            return cached
+
+        hits = self.client.search(index=self.index, body=body)['hits']['hits']
+        if hits:
+            self.cache.set(key, hits)
+        return hits
+
 
-        
     def similarity_search(self, query: str, k: int = 3, is_multimodal=True):
         vectordb = self.get_vector_store(index_name=self.index, is_multimodal=is_multimodal)
         return vectordb.similarity_search_with_score(
@@ -158,3 +599,137 @@ class OpenSearchWrapper():
             space_type='l2'
         )
 
+
+def _load_schema(schema, dimension: int = None) -> dict:
+    if isinstance(schema, str):
+        # load index schema
+        with open(schema, 'r') as f:
+            schema = json.load(f)
+
+    if not schema:
+        raise ValueError('index schema is required')
+
+    # embedding 차원 변경 시 (예: Titan v2 256/512) schema 의 vector_field 차원을 덮어씀
+    if dimension:
+        schema['mappings']['properties']['vector_field']['dimension'] = dimension
+    return schema
+
+
+def hnsw_schema(dimension: int,
+                m: int = 16,
+                ef_construction: int = 512,
+                ef_search: int = 512,
+                space_type: str = 'l2',
+                engine: str = 'faiss',
+                fp16: bool = False,
+                vector_field: str = 'vector_field',
+                properties: dict = None) -> dict:
+    '''
+    HNSW k-NN index schema 를 생성합니다. (create_index(index_body=...) / reindex 에 사용)
+    fp16=True 이면 faiss scalar quantization(fp16) 으로 vector 를 저장하여 memory 를 절반으로 줄입니다.
+    '''
+    parameters = {"m": m, "ef_construction": ef_construction}
+    if fp16:
+        if engine != 'faiss':
+            raise ValueError('fp16 encoding is only supported by the faiss engine')
+        parameters["encoder"] = {"name": "sq", "parameters": {"type": "fp16"}}
+
+    return {
+        "settings": {
+            "index.knn": True,
+            "index.knn.algo_param.ef_search": ef_search,
+        },
+        "mappings": {
+            "properties": {
+                vector_field: {
+                    "type": "knn_vector",
+                    "dimension": dimension,
+                    "method": {
+                        "name": "hnsw",
+                        "engine": engine,
+                        "space_type": space_type,
+                        "parameters": parameters,
+                    },
+                },
+                **(properties or {}),
+            }
+        },
+    }
+
+
+def compile_filter(filter: dict) -> dict:
+    '''
+    {field: value | [values] | {range}} 형태의 filter 를 OpenSearch bool filter 로 변환합니다.
+    (genai_kit.utils.vector_index.LocalVectorIndex 의 filter 와 같은 형태)
+
+        compile_filter({'product_type': ['CHAIR', 'SOFA'], 'price': {'lte': 100}})
+        # {'bool': {'filter': [{'terms': {'product_type': [...]}}, {'range': {'price': {'lte': 100}}}]}}
+    '''
+    clauses = []
+    for field, value in filter.items():
+        if isinstance(value, dict):
+            clauses.append({"range": {field: value}})
+        elif isinstance(value, (list, tuple, set)):
+            clauses.append({"terms": {field: list(value)}})
+        else:
+            clauses.append({"term": {field: value}})
+    return {"bool": {"filter": clauses}}
+
+
+def _write_jsonl(path: str, docs, page_size: int) -> int:
+    count = 0
+    with open(path, 'w') as f:
+        for doc in docs:
+            f.write(json.dumps(doc, ensure_ascii=False, default=str) + '\n')
+            count += 1
+    return count
+
+
+def _write_parquet(path: str, docs, page_size: int) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    # 문서마다 field 가 달라 page 별로 schema 를 추론하면 뒤에 나온 field 가 빠지거나 type 이 충돌하므로
+    # _source 는 JSON 문자열 column 으로 저장 (manifest 의 metadata 와 같은 방식)
+    schema = pa.schema([('_id', pa.string()), ('_source', pa.string())])
+    count, rows = 0, []
+
+    with pq.ParquetWriter(path, schema) as writer:
+        for doc in docs:
+            rows.append({'_id': doc['_id'], '_source': json.dumps(doc['_source'], ensure_ascii=False, default=str)})
+            count += 1
+            if len(rows) >= page_size:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                rows.clear()
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+    return count
+
+
+def _minmax_fusion(results: List[List[dict]], weights) -> List[dict]:
+    fused = {}
+    for hits, weight in zip(results, weights):
+        if not hits:
+            continue
+        scores = [hit['_score'] for hit in hits]
+        low, high = min(scores), max(scores)
+        for hit in hits:
+            # 모든 점수가 같으면 1 로 정규화
+            normalized = (hit['_score'] - low) / (high - low) if high > low else 1.0
+            _accumulate(fused, hit, weight * normalized)
+    return sorted(fused.values(), key=lambda hit: hit['_score'], reverse=True)
+
+
+def _rrf_fusion(results: List[List[dict]], weights, rank_constant: int = 60) -> List[dict]:
+    fused = {}
+    for hits, weight in zip(results, weights):
+        for rank, hit in enumerate(hits, start=1):
+            _accumulate(fused, hit, weight / (rank_constant + rank))
+    return sorted(fused.values(), key=lambda hit: hit['_score'], reverse=True)
+
+
+def _accumulate(fused: dict, hit: dict, score: float):
+    if hit['_id'] in fused:
+        fused[hit['_id']]['_score'] += score
+    else:
+        fused[hit['_id']] = {'_id': hit['_id'], '_score': score, '_source': hit.get('_source', {})}
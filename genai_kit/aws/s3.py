@@ -1,63 +1,194 @@
+import io
 import os
-import boto3
+import json
+import time
+import uuid
+import hashlib
 import datetime
+import tempfile
+from contextlib import contextmanager
+from typing import List
 from urllib.parse import urlparse, quote, unquote
+from concurrent.futures import ThreadPoolExecutor
+from boto3.s3.transfer import TransferConfig, create_transfer_manager
+from botocore.exceptions import ClientError
+from genai_kit.aws.client import get_client
+
+try:
+    import fcntl
+except ImportError:  # Windows: process 간 lock 없이 동작
+    fcntl = None
 
 
 class S3:
-    def __init__(self, bucket_name, region='us-west-2'):
-        self.storage = boto3.client('s3',                            
-                                    region_name = region)
+    MANIFEST_COMPACT_THRESHOLD = 100
+
+    def __init__(self, bucket_name, region='us-west-2', manifest_key=None, max_workers=16, transfer_config=None, cache=None):
+        self.storage = get_client('s3',
+                                  region_name = region)
         self.bucket_name = bucket_name
+        # opt-in local disk cache (S3ObjectCache) for get_object
+        self.cache = cache
+        # multipart threshold / chunk size / 동시 전송 수
+        # (max_concurrency 는 client 의 max_pool_connections 이하로 설정)
+        self.transfer_config = transfer_config or TransferConfig(
+            multipart_threshold=8 * 1024 * 1024,
+            multipart_chunksize=8 * 1024 * 1024,
+            max_concurrency=max_workers,
+        )
+        # upload_object 시 갱신되는 object 목록 (.jsonl 또는 .parquet). list_objects(use_manifest=True) 에서 사용
+        # upload 마다 manifest 전체를 다시 쓰지 않고 {manifest_key}.deltas/ 아래에 작은 delta 를 추가하며,
+        # 읽을 때 합치고 delta 가 MANIFEST_COMPACT_THRESHOLD 개 이상이면 manifest 로 compact 합니다.
+        self.manifest_key = manifest_key
+        # metadata 조회 등 동시 요청 수
+        self.max_workers = max_workers
 
     def upload_object(self, bytes, key, metadata=None, extra_args=None):
-        extra_args = extra_args or {}
-        if metadata:
-            formatted_metadata = {
-                f'x-amz-meta-{k.lower()}': quote(str(v)) 
-                for k, v in metadata.items()
-            }
-            extra_args['Metadata'] = formatted_metadata
-        
         self.storage.upload_fileobj(
             bytes,
             self.bucket_name,
             key,
-            ExtraArgs=extra_args
+            ExtraArgs=_upload_args(metadata, extra_args),
+            Config=self.transfer_config
         )
 
+        if self.manifest_key:
+            try:
+                response = self.storage.head_object(Bucket=self.bucket_name, Key=key)
+                self._append_manifest([_manifest_entry(key, response)])
+            except Exception as e:
+                print(f"Error updating manifest for {key}: {e}")
+
     def get_object(self, key, include_metadata=False):
+        if self.cache is not None and not include_metadata:
+            return self.cache.get(self.bucket_name, key)
+
         response = self.storage.get_object(Bucket=self.bucket_name, Key=key)
         content = response['Body'].read()
         
         if include_metadata:
-            metadata = {
-                k.replace('x-amz-meta-', ''): unquote(v)
-                for k, v in response.get('Metadata', {}).items()
-            }
-            return content, metadata
+            return content, _decode_metadata(response)
         return content
 
+    def open_stream(self, key):
+        """
+        object 전체를 메모리에 올리지 않고 읽을 수 있는 file-like object 를 반환합니다. (disk cache 를 거치지 않음)
+
+            with s3.open_stream(key) as body:
+                for chunk in body.iter_chunks(chunk_size=1024 * 1024):
+                    ...
+
+        Returns:
+            botocore.response.StreamingBody: read(n) / iter_chunks / iter_lines / close 지원
+        """
+        response = self.storage.get_object(Bucket=self.bucket_name, Key=key)
+        return response['Body']
+
+    def get_range(self, key, start, end=None):
+        """
+        object 의 일부만 읽습니다. (HTTP Range, end 포함)
+
+        Args:
+            start (int): 시작 byte. 음수이면 마지막 -start bytes (예: -65536 은 마지막 64KB)
+            end (int): 마지막 byte (포함). None 이면 끝까지
+        """
+        if start < 0:
+            byte_range = f'bytes={start}'
+        else:
+            byte_range = f'bytes={start}-{"" if end is None else end}'
+
+        response = self.storage.get_object(Bucket=self.bucket_name, Key=key, Range=byte_range)
+        return response['Body'].read()
+
     def get_object_metadata(self, key):
         try:
             response = self.storage.head_object(Bucket=self.bucket_name, Key=key)
-            return {
-                k.replace('x-amz-meta-', ''): unquote(v)
-                for k, v in response.get('Metadata', {}).items()
-            }
+            return _decode_metadata(response)
         except Exception as e:
             print(f"Error getting metadata for {key}: {e}")
             return {}
 
 
     def download_object(self, key, file_path):
-        self.storage.download_file(self.bucket_name, key, file_path)
+        self.storage.download_file(self.bucket_name, key, file_path, Config=self.transfer_config)
+
+    '''
+    Batch Transfer
+    '''
+    def upload_many(self, items):
+        """
+        여러 object 를 하나의 transfer manager (transfer_config.max_concurrency 개의 thread) 로 업로드합니다.
+
+        Args:
+            items (list): (bytes, key) 또는 (bytes, key, metadata, extra_args) 목록. bytes 는 file-like object
+
+        Returns:
+            dict: {'success', 'failed', 'errors': [(key, error)], 'bytes', 'elapsed', 'bytes_per_sec'}
+        """
+        items = [tuple(item) + (None,) * (4 - len(item)) for item in items]
+        sizes = {key: _size(fileobj) for fileobj, key, _, _ in items}
+
+        def submit(manager, item):
+            fileobj, key, metadata, extra_args = item
+            return manager.upload(fileobj, self.bucket_name, key, extra_args=_upload_args(metadata, extra_args))
+
+        report = self._transfer_many('upload', items, submit, sizes)
+
+        if self.manifest_key:
+            failed = {key for key, _ in report['errors']}
+            uploaded = [key for _, key, _, _ in items if key not in failed]
+            try:
+                with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                    heads = executor.map(lambda key: self.storage.head_object(Bucket=self.bucket_name, Key=key), uploaded)
+                    self._append_manifest([_manifest_entry(key, head) for key, head in zip(uploaded, heads)])
+            except Exception as e:
+                print(f"Error updating manifest: {e}")
+        return report
+
+    def download_many(self, items):
+        """
+        Args:
+            items (list): (key, file_path) 목록
+
+        Returns:
+            dict: upload_many 와 같은 형식
+        """
+        items = [tuple(item) for item in items]
+
+        def submit(manager, item):
+            key, file_path = item
+            return manager.download(self.bucket_name, key, file_path)
+
+        return self._transfer_many('download', items, submit, sizes=None)
+
+    def _transfer_many(self, name, items, submit, sizes):
+        report = {'success': 0, 'failed': 0, 'errors': [], 'bytes': 0}
+        start = time.perf_counter()
+
+        with create_transfer_manager(self.storage, self.transfer_config) as manager:
+            futures = [submit(manager, item) for item in items]
+            for item, future in zip(items, futures):
+                key = item[1] if name == 'upload' else item[0]
+                try:
+                    future.result()
+                    report['success'] += 1
+                    report['bytes'] += sizes[key] if sizes else os.path.getsize(item[1])
+                except Exception as e:
+                    report['failed'] += 1
+                    report['errors'].append((key, str(e)))
+
+        report['elapsed'] = time.perf_counter() - start
+        report['bytes_per_sec'] = report['bytes'] / report['elapsed'] if report['elapsed'] else 0.0
+        print(f"{name} {report['success']} objects ({report['failed']} failed), "
+              f"{report['bytes'] / 1024 / 1024:.1f}MB in {report['elapsed']:.1f}s "
+              f"({report['bytes_per_sec'] / 1024 / 1024:.1f}MB/s)")
+        return report
 
     def extract_key_from_uri(self, s3_uri):
         parsed_uri = urlparse(s3_uri)
         return parsed_uri.path.lstrip('/')
     
-    def list_objects(self, formats=None, prefix='', recursive=True, include_metadata=False):
+    def list_objects(self, formats=None, prefix='', recursive=True, include_metadata=False, use_manifest=False):
         """
         특정 파일 포맷에 해당하는 S3 객체의 키 목록과 메타데이터를 최신 순으로 반환합니다.
         
@@ -66,6 +197,7 @@ class S3:
             prefix (str): 검색할 경로 접두사
             recursive (bool): 하위 디렉토리까지 검색할지 여부
             include_metadata (bool): 메타데이터 포함 여부
+            use_manifest (bool): manifest_key 가 설정된 경우 N 번의 HEAD 대신 manifest 하나를 읽어서 반환
         
         Returns:
             list: 최신 순으로 정렬된 파일 정보 목록 (메타데이터 포함 시 딕셔너리 형태)
@@ -74,6 +206,12 @@ class S3:
         paginator = self.storage.get_paginator('list_objects_v2')
         
         formats = [fmt.lower() if not fmt.startswith('.') else fmt.lower() for fmt in formats] if formats else []
+
+        if use_manifest and self.manifest_key:
+            object_info = self._list_from_manifest(formats, prefix, recursive)
+            if include_metadata:
+                return sorted(object_info, key=lambda x: x['last_modified'], reverse=True)
+            return [item['key'] for item in sorted(object_info, key=lambda x: x['last_modified'], reverse=True)]
         
         kwargs = {
             'Bucket': self.bucket_name,
@@ -87,17 +225,18 @@ class S3:
                 if 'Contents' in page:
                     for obj in page['Contents']:
                         key = obj['Key']
+                        if self._is_manifest(key):
+                            continue
                         if formats:
                             file_extension = os.path.splitext(key)[1].lower()
                             if file_extension not in formats:
                                 continue
                         
                         if include_metadata:
-                            metadata = self.get_object_metadata(key)
                             object_info.append({
                                 'key': key,
                                 'last_modified': obj['LastModified'],
-                                'metadata': metadata
+                                'metadata': None
                             })
                         else:
                             object_info.append((key, obj['LastModified']))
@@ -105,11 +244,11 @@ class S3:
                 if not recursive and 'CommonPrefixes' in page:
                     for prefix_obj in page['CommonPrefixes']:
                         if include_metadata:
-                            metadata = self.get_object_metadata(key)
+                            # prefix 는 object 가 아니므로 metadata 가 없음
                             object_info.append({
                                 'key': prefix_obj['Prefix'],
                                 'last_modified': datetime.datetime.now(datetime.timezone.utc),
-                                'metadata': metadata
+                                'metadata': {}
                             })
                         else:
                             object_info.append((prefix_obj['Prefix'], 
@@ -120,5 +259,433 @@ class S3:
             raise
         
         if include_metadata:
+            # HEAD 요청은 thread pool 에서 동시에 실행
+            pending = [item for item in object_info if item['metadata'] is None]
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                for item, metadata in zip(pending, executor.map(self.get_object_metadata, [item['key'] for item in pending])):
+                    item['metadata'] = metadata
             return sorted(object_info, key=lambda x: x['last_modified'], reverse=True)
-        return [item[0] for item in sorted(object_info, key=lambda x: x[1], reverse=True)]
\ No newline at end of file
+        return [item[0] for item in sorted(object_info, key=lambda x: x[1], reverse=True)]
+
+    '''
+    Manifest
+    '''
+    def rebuild_manifest(self, prefix=''):
+        """
+        현재 object 목록(metadata 포함)으로 manifest 를 다시 생성합니다. 기존 bucket 에 manifest 를 도입할 때 사용합니다.
+        """
+        deltas = self._list_manifest_deltas()
+        objects = self.list_objects(prefix=prefix, include_metadata=True)
+        entries = [{
+            'key': item['key'],
+            'last_modified': item['last_modified'].isoformat(),
+            'metadata': item['metadata'],
+        } for item in objects]
+        self.storage.put_object(
+            Bucket=self.bucket_name,
+            Key=self.manifest_key,
+            Body=_dump_manifest(entries, self.manifest_key)
+        )
+        # 목록을 만들기 전에 있던 delta 는 이미 반영되었으므로 삭제
+        self._delete_manifest_deltas(deltas)
+        print(f'manifest {self.manifest_key}: {len(entries)} objects')
+
+    def compact_manifest(self):
+        """
+        쌓인 delta 를 manifest 에 합치고 삭제합니다. 다른 writer 가 먼저 compact 한 경우 아무것도 하지 않습니다.
+
+        Returns:
+            bool: compact 여부
+        """
+        manifest, etag, deltas = self._read_manifest()
+        if not deltas:
+            return False
+
+        condition = {'IfMatch': etag} if etag else {'IfNoneMatch': '*'}
+        try:
+            self.storage.put_object(
+                Bucket=self.bucket_name,
+                Key=self.manifest_key,
+                Body=_dump_manifest(manifest.values(), self.manifest_key),
+                **condition
+            )
+        except ClientError as e:
+            if e.response['Error']['Code'] in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                return False
+            raise
+        self._delete_manifest_deltas(deltas)
+        return True
+
+    def _is_manifest(self, key):
+        return bool(self.manifest_key) and (key == self.manifest_key or key.startswith(self._manifest_delta_prefix()))
+
+    def _manifest_delta_prefix(self):
+        return f'{self.manifest_key}.deltas/'
+
+    def _append_manifest(self, entries: List[dict]):
+        # 시간순으로 정렬되는 이름의 delta object 하나만 쓰므로 manifest 크기와 무관하고 writer 간 충돌이 없음
+        if not entries:
+            return
+        delta_key = f'{self._manifest_delta_prefix()}{time.time_ns():020d}-{uuid.uuid4().hex}.jsonl'
+        self.storage.put_object(
+            Bucket=self.bucket_name,
+            Key=delta_key,
+            Body=_dump_manifest(entries, delta_key)
+        )
+
+    def _list_manifest_deltas(self):
+        paginator = self.storage.get_paginator('list_objects_v2')
+        keys = []
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=self._manifest_delta_prefix()):
+            keys.extend(obj['Key'] for obj in page.get('Contents', []))
+        return sorted(keys)
+
+    def _delete_manifest_deltas(self, keys):
+        for i in range(0, len(keys), 1000):
+            self.storage.delete_objects(
+                Bucket=self.bucket_name,
+                Delete={'Objects': [{'Key': key} for key in keys[i:i + 1000]], 'Quiet': True}
+            )
+
+    def _read_manifest(self):
+        """
+        Returns:
+            (dict, str, list): key -> entry (delta 적용 후), manifest ETag, 적용한 delta key 목록
+        """
+        deltas = self._list_manifest_deltas()
+        try:
+            response = self.storage.get_object(Bucket=self.bucket_name, Key=self.manifest_key)
+            entries = _load_manifest(response['Body'].read(), self.manifest_key)
+            etag = response['ETag']
+        except ClientError as e:
+            if e.response['Error']['Code'] not in ('NoSuchKey', '404'):
+                raise
+            entries, etag = [], None
+
+        manifest = {entry['key']: entry for entry in entries}
+
+        def read_delta(key):
+            try:
+                body = self.storage.get_object(Bucket=self.bucket_name, Key=key)['Body'].read()
+            except ClientError as e:
+                # 목록 이후 다른 writer 의 compact 로 삭제된 delta 는 이미 manifest 에 반영됨
+                if e.response['Error']['Code'] in ('NoSuchKey', '404'):
+                    return []
+                raise
+            return _load_manifest(body, key)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for delta in executor.map(read_delta, deltas):
+                manifest.update({entry['key']: entry for entry in delta})
+        return manifest, etag, deltas
+
+    def _list_from_manifest(self, formats, prefix, recursive):
+        manifest, _, deltas = self._read_manifest()
+        if len(deltas) >= self.MANIFEST_COMPACT_THRESHOLD:
+            try:
+                self.compact_manifest()
+            except Exception as e:
+                print(f"Error compacting manifest: {e}")
+        object_info, prefixes = [], set()
+        for key, entry in manifest.items():
+            if not key.startswith(prefix):
+                continue
+            if not recursive and '/' in key[len(prefix):]:
+                prefixes.add(prefix + key[len(prefix):].split('/', 1)[0] + '/')
+                continue
+            if formats and os.path.splitext(key)[1].lower() not in formats:
+                continue
+            object_info.append({
+                'key': key,
+                'last_modified': datetime.datetime.fromisoformat(entry['last_modified']),
+                'metadata': entry.get('metadata') or {}
+            })
+
+        now = datetime.datetime.now(datetime.timezone.utc)
+        object_info.extend({'key': p, 'last_modified': now, 'metadata': {}} for p in prefixes)
+        return object_info
+
+
+class S3ObjectCache:
+    '''
+    S3 object 의 local read-through disk cache
+
+    object 는 path 아래에 sha256(bucket/key) 이름의 파일로 저장되고, 이후 요청은 ETag 로 조건부 GET
+    (If-None-Match) 을 보내 변경되지 않았으면(304) local 파일을 그대로 사용합니다.
+    max_age 안에 검증된 object 는 S3 요청 없이 바로 읽습니다. (변하지 않는 dataset 에 사용)
+
+    전체 크기는 .usage.json 에 누적 관리하고, max_bytes 를 넘을 때만 directory 를 훑어
+    가장 오래 사용되지 않은(mtime) object 부터 삭제합니다.
+    file lock 으로 여러 process 가 같은 directory 를 공유할 수 있습니다.
+
+        cache = S3ObjectCache(max_bytes=5 * 1024**3, max_age=24 * 3600)
+        content = cache.get('amazon-berkeley-objects', 'images/small/...')
+    '''
+    # eviction 시 max_bytes 의 이 비율까지 줄여서, 가득 찬 상태에서 miss 마다 directory 를 훑지 않도록 함
+    EVICT_TARGET = 0.9
+
+    def __init__(self, path=None, max_bytes=5 * 1024 ** 3, max_age=None, region=None):
+        self.path = path or os.path.join(os.path.expanduser('~'), '.cache', 'genai_kit', 's3')
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.storage = get_client('s3', region_name=region)
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        os.makedirs(self.path, exist_ok=True)
+
+    def get(self, bucket, key) -> bytes:
+        # entry lock 을 잡은 상태에서 읽어서, 다른 process 의 eviction 과 겹치지 않도록 함
+        return self._load(bucket, key, _read_bytes)
+
+    def get_path(self, bucket, key) -> str:
+        """
+        object 를 cache 에 받아두고 local 파일 경로를 반환합니다.
+        반환 이후 다른 process 의 eviction 으로 파일이 삭제될 수 있으므로, 내용이 필요하면 get 을 사용합니다.
+        """
+        return self._load(bucket, key, lambda data_path: data_path)
+
+    def _load(self, bucket, key, read):
+        name = hashlib.sha256(f'{bucket}/{key}'.encode('utf-8')).hexdigest()
+        data_path = os.path.join(self.path, name[:2], name)
+        meta_path = f'{data_path}.json'
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        added = 0
+
+        with _file_lock(f'{data_path}.lock'):
+            meta = _read_json(meta_path) if os.path.exists(data_path) else None
+
+            if meta and self.max_age and time.time() - meta['validated_at'] < self.max_age:
+                self.hits += 1
+                os.utime(data_path)
+                return read(data_path)
+
+            try:
+                response = self.storage.get_object(
+                    Bucket=bucket,
+                    Key=key,
+                    **({'IfNoneMatch': meta['etag']} if meta else {})
+                )
+            except ClientError as e:
+                if meta and e.response['Error']['Code'] in ('304', 'NotModified'):
+                    self.revalidated += 1
+                    meta['validated_at'] = time.time()
+                    _write_atomic(meta_path, json.dumps(meta).encode('utf-8'))
+                    os.utime(data_path)
+                    return read(data_path)
+                raise
+
+            self.misses += 1
+            previous = _entry_size(data_path) if meta else 0
+            _write_atomic(data_path, response['Body'].iter_chunks(1024 * 1024))
+            _write_atomic(meta_path, json.dumps({
+                'bucket': bucket,
+                'key': key,
+                'etag': response['ETag'],
+                'size': response.get('ContentLength'),
+                'validated_at': time.time(),
+            }).encode('utf-8'))
+            added = _entry_size(data_path) - previous
+            result = read(data_path)
+
+        # 방금 받은 object 는 evict 대상에서 제외 (max_bytes 보다 큰 object 도 한 번은 반환)
+        self._account(added, keep=data_path)
+        return result
+
+    def clear(self):
+        with _file_lock(os.path.join(self.path, '.evict.lock')):
+            for data_path, _, _ in self._entries():
+                _remove(data_path)
+            _write_atomic(self._usage_path(), json.dumps({'bytes': 0}).encode('utf-8'))
+
+    def stats(self) -> dict:
+        entries = self._entries()
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'revalidated': self.revalidated,
+            'items': len(entries),
+            'bytes': sum(size for _, size, _ in entries),
+        }
+
+    def _entries(self):
+        entries = []
+        for root, _, files in os.walk(self.path):
+            for file in files:
+                if '.' in file:
+                    continue
+                data_path = os.path.join(root, file)
+                try:
+                    mtime = os.stat(data_path).st_mtime
+                except FileNotFoundError:
+                    continue
+                entries.append((data_path, _entry_size(data_path), mtime))
+        return entries
+
+    def _usage_path(self):
+        return os.path.join(self.path, '.usage.json')
+
+    def _account(self, added: int, keep=None):
+        # cache miss 마다 directory 전체를 훑지 않도록 누적 크기만 갱신하고, max_bytes 를 넘을 때만 eviction
+        with _file_lock(os.path.join(self.path, '.evict.lock')):
+            usage = _read_json(self._usage_path())
+            if usage is None:
+                # 처음 사용하거나 usage 파일이 없어진 경우 한 번만 다시 계산 (방금 받은 object 포함)
+                total = sum(size for _, size, _ in self._entries())
+            else:
+                total = usage['bytes'] + added
+
+            if total > self.max_bytes:
+                total = self._evict(keep)
+            _write_atomic(self._usage_path(), json.dumps({'bytes': total}).encode('utf-8'))
+
+    def _evict(self, keep=None) -> int:
+        # .evict.lock 을 잡은 상태에서 호출. 실제 크기로 다시 계산하여 evict 후 남은 크기를 반환
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        target = self.max_bytes * self.EVICT_TARGET
+        for data_path, size, _ in sorted(entries, key=lambda x: x[2]):
+            if total <= target:
+                break
+            if data_path == keep:
+                continue
+            # 다른 process 가 사용 중인 object 는 건너뜀
+            with _file_lock(f'{data_path}.lock', blocking=False) as locked:
+                if locked:
+                    _remove(data_path)
+                    total -= size
+        return total
+
+
+def _upload_args(metadata=None, extra_args=None):
+    extra_args = dict(extra_args or {})
+    if metadata:
+        formatted_metadata = {
+            f'x-amz-meta-{k.lower()}': quote(str(v)) 
+            for k, v in metadata.items()
+        }
+        extra_args['Metadata'] = formatted_metadata
+    return extra_args
+
+
+def _size(fileobj):
+    if hasattr(fileobj, 'getbuffer'):
+        return fileobj.getbuffer().nbytes
+    position = fileobj.tell()
+    size = fileobj.seek(0, os.SEEK_END) - position
+    fileobj.seek(position)
+    return size
+
+
+def _decode_metadata(response):
+    return {
+        k.replace('x-amz-meta-', ''): unquote(v)
+        for k, v in response.get('Metadata', {}).items()
+    }
+
+
+def _manifest_entry(key, head_response):
+    return {
+        'key': key,
+        'last_modified': head_response['LastModified'].isoformat(),
+        'size': head_response.get('ContentLength'),
+        'metadata': _decode_metadata(head_response),
+    }
+
+
+def _dump_manifest(entries, manifest_key) -> bytes:
+    entries = list(entries)
+    if manifest_key.endswith('.parquet'):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        rows = [{**entry, 'metadata': json.dumps(entry.get('metadata') or {}, ensure_ascii=False)} for entry in entries]
+        buffer = io.BytesIO()
+        pq.write_table(pa.Table.from_pylist(rows), buffer)
+        return buffer.getvalue()
+    return ''.join(json.dumps(entry, ensure_ascii=False) + '\n' for entry in entries).encode('utf-8')
+
+
+def _load_manifest(data: bytes, manifest_key) -> List[dict]:
+    if manifest_key.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        rows = pq.read_table(io.BytesIO(data)).to_pylist()
+        return [{**row, 'metadata': json.loads(row.get('metadata') or '{}')} for row in rows]
+    return [json.loads(line) for line in data.decode('utf-8').splitlines() if line]
+
+
+@contextmanager
+def _file_lock(path, blocking=True):
+    if fcntl is None:
+        yield True
+        return
+
+    while True:
+        with open(path, 'a') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+
+            # 기다리는 동안 eviction 으로 lock 파일이 삭제(또는 재생성)되었으면 새 파일로 다시 시도
+            try:
+                current = os.stat(path).st_ino == os.fstat(f.fileno()).st_ino
+            except FileNotFoundError:
+                current = False
+            if not current:
+                fcntl.flock(f, fcntl.LOCK_UN)
+                continue
+
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            return
+
+
+def _write_atomic(path, data):
+    # 같은 directory 의 임시 파일에 쓴 뒤 교체하여, 읽는 쪽이 쓰는 중인 파일을 보지 않도록 함
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            for chunk in ([data] if isinstance(data, bytes) else data):
+                f.write(chunk)
+        os.replace(tmp_path, path)
+    except BaseException:
+        _remove(tmp_path)
+        raise
+
+
+def _read_bytes(path) -> bytes:
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def _remove(data_path):
+    # lock 파일은 lock 을 잡은 상태에서 마지막에 삭제 (_file_lock 이 삭제된 lock 파일을 감지하여 재시도)
+    for path in (data_path, f'{data_path}.json', f'{data_path}.lock'):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def _entry_size(data_path) -> int:
+    # data 파일 + metadata 파일 크기
+    size = 0
+    for path in (data_path, f'{data_path}.json'):
+        try:
+            size += os.path.getsize(path)
+        except FileNotFoundError:
+            pass
+    return size
@@ -1,6 +1,6 @@
-import boto3
 import json
 from botocore.config import Config
+from genai_kit.aws.client import get_client
 from genai_kit.utils.random import seed
 
 
@@ -8,7 +8,7 @@ class BedrockStableDiffusion():
     def __init__(self, modelId: str, region='us-west-2'):
         self.region = region
         self.modelId = modelId
-        self.bedrock = boto3.client(
+        self.bedrock = get_client(
             service_name = 'bedrock-runtime',
             region_name = self.region,
             config = Config(
@@ -0,0 +1,80 @@
+'''
+BedrockClaude sync / async 처리량 비교
+
+local stub endpoint 를 띄운 뒤 동일한 요청 수를
+- sync: converse 를 순차 호출
+- async: aconverse 를 asyncio.gather 로 동시 호출
+하여 처리량(req/s)을 비교합니다.
+
+    python -m genai_kit.benchmark.claude_async --requests 200 --concurrency 50 --latency 0.2
+'''
+import os
+import time
+import asyncio
+import argparse
+
+import boto3
+from botocore.config import Config
+
+from genai_kit.aws.claude import BedrockClaude
+from genai_kit.benchmark.stub_server import start_stub_server
+
+
+def _stub_claude(endpoint: str, concurrency: int) -> BedrockClaude:
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'stub')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'stub')
+
+    claude = BedrockClaude(region='us-west-2', max_concurrency=concurrency)
+    claude.bedrock = boto3.client(
+        service_name='bedrock-runtime',
+        region_name='us-west-2',
+        endpoint_url=endpoint,
+        config=Config(retries={'max_attempts': 0}, max_pool_connections=concurrency),
+    )
+    return claude
+
+
+def run_sync(claude: BedrockClaude, n: int) -> float:
+    start = time.perf_counter()
+    for i in range(n):
+        claude.converse(text=f'request {i}')
+    return time.perf_counter() - start
+
+
+def run_async(claude: BedrockClaude, n: int) -> float:
+    async def _main():
+        await asyncio.gather(*[claude.aconverse(text=f'request {i}') for i in range(n)])
+
+    start = time.perf_counter()
+    asyncio.run(_main())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.2, help='stub response latency (sec)')
+    args = parser.parse_args()
+
+    server, endpoint = start_stub_server(latency=args.latency)
+    try:
+        claude = _stub_claude(endpoint, args.concurrency)
+
+        # sync 경로는 느리므로 요청 수를 줄여 측정 후 처리량으로 비교
+        sync_n = min(args.requests, max(1, int(5 / args.latency)))
+        sync_elapsed = run_sync(claude, sync_n)
+        async_elapsed = run_async(claude, args.requests)
+
+        sync_rps = sync_n / sync_elapsed
+        async_rps = args.requests / async_elapsed
+        print(f'sync : {sync_n:5d} req in {sync_elapsed:7.2f}s -> {sync_rps:8.1f} req/s')
+        print(f'async: {args.requests:5d} req in {async_elapsed:7.2f}s -> {async_rps:8.1f} req/s '
+              f'(concurrency={args.concurrency})')
+        print(f'speedup: {async_rps / sync_rps:.1f}x')
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
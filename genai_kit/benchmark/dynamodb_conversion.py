@@ -0,0 +1,121 @@
+'''
+DynamoDB item 변환 비용 비교: json 왕복 vs 재귀 converter
+
+bedrock_gallery 에 저장되는 image / video record 와 비슷한 item 으로
+- json: json.loads(json.dumps(item, default=...), parse_float=Decimal)  (기존 방식)
+- direct: _to_dynamodb / _from_dynamodb  (한 번의 순회)
+의 쓰기(put) / 읽기(get) 방향 변환 시간과 할당량(tracemalloc)을 출력합니다. DynamoDB 연결은 필요 없습니다.
+
+    python -m genai_kit.benchmark.dynamodb_conversion --items 1000 --repeat 5
+'''
+import json
+import time
+import random
+import argparse
+import tracemalloc
+from decimal import Decimal
+from datetime import datetime
+
+from genai_kit.aws.bedrock import BedrockModel
+from genai_kit.aws.dynamodb import _default_serializer, _from_dynamodb, _to_dynamodb
+
+
+def make_record(rng: random.Random, index: int) -> dict:
+    now = datetime.now().isoformat()
+    return {
+        "id": f"{index:08x}",
+        "media_type": rng.choice(["image", "video"]),
+        "model_type": "amazon.nova-canvas-v1:0",
+        "prompt": "a cozy reading nook with warm lighting, watercolor style " * 2,
+        "ref_image": None,
+        "url": f"https://d1234.cloudfront.net/images/{index:08x}",
+        "created_at": now,
+        "updated_at": now,
+        "details": {
+            "taskType": "TEXT_IMAGE",
+            "textToImageParams": {
+                "text": "a cozy reading nook with warm lighting, watercolor style",
+                "negativeText": "blurry, low quality, watermark",
+            },
+            "imageGenerationConfig": {
+                "numberOfImages": 1,
+                "quality": "premium",
+                "height": 1024,
+                "width": 1024,
+                "cfgScale": round(rng.uniform(1.1, 10.0), 1),
+                "seed": rng.randrange(2 ** 31),
+            },
+            "response": {
+                "latency": rng.random() * 10,
+                "scores": [rng.random() for _ in range(32)],
+                "tags": [f"tag-{rng.randrange(100)}" for _ in range(8)],
+            },
+        },
+    }
+
+
+def json_to_dynamodb(item):
+    return json.loads(json.dumps(item, default=_default_serializer), parse_float=Decimal)
+
+
+def json_from_dynamodb(item):
+    return json.loads(json.dumps(item, default=_default_serializer))
+
+
+def measure(fn, items, repeat: int):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            fn(item)
+        best = min(best, time.perf_counter() - start)
+
+    # item 하나를 변환하는 동안 추가로 잡히는 memory 의 최대값 (임시 문자열 + 결과)
+    peaks = []
+    tracemalloc.start()
+    for item in items:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        fn(item)
+        peaks.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+
+    return best / len(items) * 1e6, sum(peaks) / len(peaks)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--items', type=int, default=1000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    records = [make_record(rng, i) for i in range(args.items)]
+    stored = [json_to_dynamodb(record) for record in records]
+
+    for record, item in zip(records, stored):
+        assert _to_dynamodb(record) == item
+        assert _from_dynamodb(item) == json_from_dynamodb(item)
+
+    # str Enum / 비 str key, tuple, datetime 도 json 왕복과 같아야 함
+    edge = {
+        BedrockModel.NOVA_PRO: 1.5,
+        1: (0.1, datetime(2024, 1, 1)),
+        None: {True: Decimal('2')},
+        "model": BedrockModel.NOVA_PRO,
+    }
+    assert _to_dynamodb(edge) == json_to_dynamodb(edge)
+
+    print(f'{len(records)} records, {len(json.dumps(records[0]))} bytes each (JSON)')
+    print(f'{"direction":<10} {"method":<8} {"us/item":>9} {"peak bytes/item":>16}')
+    for direction, cases in [
+        ('put', [('json', json_to_dynamodb, records), ('direct', _to_dynamodb, records)]),
+        ('get', [('json', json_from_dynamodb, stored), ('direct', _from_dynamodb, stored)]),
+    ]:
+        for method, fn, items in cases:
+            us, peak = measure(fn, items, args.repeat)
+            print(f'{direction:<10} {method:<8} {us:>9.1f} {peak:>16.0f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+'''
+Titan Text Embeddings v2 출력 차원별 recall@k / index 크기 / query latency 비교
+
+corpus 를 1024 차원으로 embedding 한 exact top-k 결과를 정답으로 두고,
+256 / 512 차원 embedding 의 exact top-k 가 얼마나 일치하는지(recall@k) 측정합니다.
+
+    python -m genai_kit.benchmark.embedding_dimensions --corpus corpus.txt --queries 100 --k 10
+'''
+import time
+import argparse
+import numpy as np
+
+from genai_kit.aws.embedding import BedrockEmbedding
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ corpus.T
+    top = np.argpartition(-scores, kth=min(k, corpus.shape[0] - 1), axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def recall_at_k(truth: np.ndarray, pred: np.ndarray) -> float:
+    hits = [len(set(t) & set(p)) / len(t) for t, p in zip(truth, pred)]
+    return float(np.mean(hits))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--corpus', required=True, help='text file, one document per line')
+    parser.add_argument('--queries', type=int, default=100, help='number of documents used as queries')
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--region', default='us-west-2')
+    parser.add_argument('--max-workers', type=int, default=10)
+    args = parser.parse_args()
+
+    with open(args.corpus, 'r') as f:
+        docs = [line.strip() for line in f if line.strip()]
+    rng = np.random.default_rng(0)
+    query_ids = rng.choice(len(docs), size=min(args.queries, len(docs)), replace=False)
+
+    results = {}
+    for dim in BedrockEmbedding.TITAN_V2_DIMENSIONS:
+        embedding = BedrockEmbedding(region=args.region, dimensions=dim, normalize=True)
+        corpus, failed = embedding.embed_text_batch(docs, max_workers=args.max_workers)
+        if failed.any():
+            print(f'[{dim}] {failed.sum()} documents failed to embed')
+        queries = corpus[query_ids]
+
+        start = time.perf_counter()
+        top = exact_top_k(corpus, queries, args.k)
+        latency = (time.perf_counter() - start) / len(queries) * 1000
+        results[dim] = (top, corpus.nbytes, latency)
+
+    truth = results[1024][0]
+    print(f'{"dim":>6} {"recall@" + str(args.k):>10} {"index size":>12} {"query (ms)":>11}')
+    for dim, (top, nbytes, latency) in sorted(results.items()):
+        print(f'{dim:>6} {recall_at_k(truth, top):>10.3f} {nbytes / 1024 / 1024:>10.1f}MB {latency:>11.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+'''
+filter 선택도(selectivity)별 efficient k-NN filtering vs post-filtering 비교
+
+같은 query vector 에 대해
+- efficient: knn clause 안의 filter (engine 이 exact / approximate 를 선택)
+- post-filter: knn 으로 k * oversample 개를 가져온 뒤 post_filter 로 거름
+- exact: filter 후 script_score(knn_score) 로 계산한 정답
+을 실행하여 recall@k 와 latency 를 출력합니다.
+
+    python -m genai_kit.benchmark.filtered_knn --endpoint https://... --index products \
+        --field metadata.product_type --values CHAIR SOFA LAMP --queries 50 --k 10
+'''
+import time
+import argparse
+import numpy as np
+
+from genai_kit.aws.opensearch import OpenSearchWrapper, compile_filter
+
+
+def sample_query_vectors(wrapper: OpenSearchWrapper, n: int, seed: int = 0):
+    res = wrapper.client.search(index=wrapper.index, body={
+        "size": n,
+        "_source": ["vector_field"],
+        "query": {"function_score": {"query": {"match_all": {}}, "random_score": {"seed": seed, "field": "_seq_no"}}},
+    })
+    return [hit['_source']['vector_field'] for hit in res['hits']['hits']]
+
+
+def exact_search(wrapper: OpenSearchWrapper, vector, k: int, filter: dict, space_type: str):
+    res = wrapper.client.search(index=wrapper.index, body={
+        "size": k,
+        "_source": False,
+        "query": {
+            "script_score": {
+                "query": compile_filter(filter),
+                "script": {
+                    "source": "knn_score",
+                    "lang": "knn",
+                    "params": {"field": "vector_field", "query_value": vector, "space_type": space_type},
+                },
+            }
+        },
+    })
+    return [hit['_id'] for hit in res['hits']['hits']]
+
+
+def efficient_search(wrapper: OpenSearchWrapper, vector, k: int, filter: dict):
+    return [hit['_id'] for hit in wrapper.vector_search(vector, k=k, filter=filter)]
+
+
+def post_filter_search(wrapper: OpenSearchWrapper, vector, k: int, filter: dict, oversample: int):
+    res = wrapper.client.search(index=wrapper.index, body={
+        "size": k,
+        "_source": False,
+        "query": {"knn": {"vector_field": {"vector": vector, "k": k * oversample}}},
+        "post_filter": compile_filter(filter),
+    })
+    return [hit['_id'] for hit in res['hits']['hits']]
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, (time.perf_counter() - start) * 1000
+
+
+def recall(truth, pred):
+    return len(set(truth) & set(pred)) / len(truth) if truth else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--endpoint', required=True)
+    parser.add_argument('--index', required=True)
+    parser.add_argument('--region', default='us-west-2')
+    parser.add_argument('--field', required=True, help='keyword field used for the filter')
+    parser.add_argument('--values', nargs='+', required=True, help='filter values (one run per value)')
+    parser.add_argument('--queries', type=int, default=50)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--oversample', type=int, default=5, help='post-filter fetches k * oversample')
+    parser.add_argument('--space-type', default='cosinesimil')
+    args = parser.parse_args()
+
+    wrapper = OpenSearchWrapper(args.endpoint, args.index, region=args.region)
+    total = wrapper.client.count(index=args.index)['count']
+    vectors = sample_query_vectors(wrapper, args.queries)
+
+    print(f'{"value":>16} {"selectivity":>11} {"efficient recall":>17} {"p50 ms":>8} '
+          f'{"post-filter recall":>19} {"p50 ms":>8}')
+    for value in args.values:
+        filter = {args.field: value}
+        matched = wrapper.client.count(index=args.index, body={"query": compile_filter(filter)})['count']
+
+        efficient_recall, efficient_ms, post_recall, post_ms = [], [], [], []
+        for vector in vectors:
+            truth = exact_search(wrapper, vector, args.k, filter, args.space_type)
+
+            ids, ms = timed(efficient_search, wrapper, vector, args.k, filter)
+            efficient_recall.append(recall(truth, ids))
+            efficient_ms.append(ms)
+
+            ids, ms = timed(post_filter_search, wrapper, vector, args.k, filter, args.oversample)
+            post_recall.append(recall(truth, ids))
+            post_ms.append(ms)
+
+        print(f'{value:>16} {matched / total:>11.4f} {np.mean(efficient_recall):>17.3f} {np.median(efficient_ms):>8.1f} '
+              f'{np.mean(post_recall):>19.3f} {np.median(post_ms):>8.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,180 @@
+'''
+k-NN index parameter tuning harness
+
+corpus vector 로 parameter grid 별 index 를 만들고 query set 을 실행하여
+recall@k / p50, p99 latency / index 크기 / build 시간을 출력합니다. 정답은 NumPy exact top-k 입니다.
+
+- OpenSearch (HNSW): m, ef_construction, ef_search, space type, fp16 encoding
+      docker run -p 9200:9200 -e discovery.type=single-node -e DISABLE_SECURITY_PLUGIN=true opensearchproject/opensearch
+      python -m genai_kit.benchmark.hnsw_tuning --vectors corpus.npy --endpoint http://localhost:9200 \
+          --m 16 32 --ef-construction 128 512 --ef-search 64 256 512 --space-type l2 cosinesimil --encoding fp32 fp16
+
+- in-process stand-in (LocalVectorIndex IVF): nlist, nprobe, space type, fp16
+      python -m genai_kit.benchmark.hnsw_tuning --vectors ./embeddings --local --nlist 256 1024 --nprobe 4 16 64
+
+--vectors 는 (N, dim) .npy 파일 또는 EmbeddingStore 디렉터리입니다.
+'''
+import os
+import time
+import argparse
+import itertools
+import numpy as np
+from opensearchpy import OpenSearch
+
+from genai_kit.aws.opensearch import OpenSearchWrapper, hnsw_schema
+from genai_kit.utils.embedding_store import EmbeddingStore
+from genai_kit.utils.vector_index import LocalVectorIndex
+
+
+def load_vectors(path: str) -> np.ndarray:
+    if os.path.isdir(path):
+        return np.asarray(EmbeddingStore(path).vectors, dtype=np.float32)
+    return np.load(path).astype(np.float32)
+
+
+def exact_top_k(corpus: np.ndarray, queries: np.ndarray, k: int, space_type: str) -> np.ndarray:
+    if space_type == 'cosinesimil':
+        corpus = corpus / np.maximum(np.linalg.norm(corpus, axis=1, keepdims=True), 1e-12)
+        queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+    scores = queries @ corpus.T
+    if space_type == 'l2':
+        # ||q - x||^2 의 순서는 -2 q.x + ||x||^2 로 결정됨
+        scores = 2 * scores - (corpus * corpus).sum(axis=1)[None, :]
+    top = np.argpartition(-scores, kth=k - 1, axis=1)[:, :k]
+    order = np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1)
+    return np.take_along_axis(top, order, axis=1)
+
+
+def recall_at_k(truth: np.ndarray, pred) -> float:
+    return float(np.mean([len(set(t) & set(p)) / len(t) for t, p in zip(truth, pred)]))
+
+
+def report(params: str, truth: np.ndarray, pred, latencies, size_bytes: int, build_seconds: float):
+    print(f'{params:<48} {recall_at_k(truth, pred):>9.3f} {np.percentile(latencies, 50):>8.2f} '
+          f'{np.percentile(latencies, 99):>8.2f} {size_bytes / 1024 / 1024:>10.1f} {build_seconds:>9.1f}')
+
+
+def run_opensearch(args, corpus: np.ndarray, queries: np.ndarray, truth: dict):
+    client = None if args.aws else OpenSearch(hosts=[args.endpoint], timeout=600)
+
+    grid = itertools.product(args.m, args.ef_construction, args.space_type, args.encoding)
+    for m, ef_construction, space_type, encoding in grid:
+        name = f'{args.index_prefix}-m{m}-efc{ef_construction}-{space_type}-{encoding}'
+        wrapper = OpenSearchWrapper(args.endpoint, name, region=args.region, client=client)
+        wrapper.create_index(
+            index_path=None,
+            index_body=hnsw_schema(
+                dimension=corpus.shape[1],
+                m=m,
+                ef_construction=ef_construction,
+                space_type=space_type,
+                engine=args.engine,
+                fp16=encoding == 'fp16',
+            ),
+        )
+
+        # build 시간 = bulk 적재 + 1 segment 로 force merge (검색 시 graph 하나만 탐색하도록)
+        start = time.perf_counter()
+        wrapper.bulk_upsert(
+            ((str(i), {'vector_field': vector.tolist()}) for i, vector in enumerate(corpus)),
+            chunk_size=args.chunk_size,
+            max_workers=args.max_workers,
+        )
+        wrapper.client.indices.forcemerge(index=name, max_num_segments=1, params={'request_timeout': 3600})
+        build_seconds = time.perf_counter() - start
+
+        stats = wrapper.client.indices.stats(index=name)
+        size_bytes = stats['_all']['primaries']['store']['size_in_bytes']
+        wrapper.client.transport.perform_request('GET', f'/_plugins/_knn/warmup/{name}')
+
+        for ef_search in args.ef_search:
+            wrapper.client.indices.put_settings(index=name, body={'index': {'knn.algo_param.ef_search': ef_search}})
+            pred, latencies = [], []
+            for query in queries:
+                start = time.perf_counter()
+                res = wrapper.client.search(index=name, body={
+                    'size': args.k,
+                    '_source': False,
+                    'query': {'knn': {'vector_field': {'vector': query.tolist(), 'k': args.k}}},
+                })
+                latencies.append((time.perf_counter() - start) * 1000)
+                pred.append([int(hit['_id']) for hit in res['hits']['hits']])
+
+            params = f'm={m} efc={ef_construction} efs={ef_search} {space_type} {encoding}'
+            report(params, truth[space_type], pred, latencies, size_bytes, build_seconds)
+
+        if not args.keep:
+            wrapper.delete_index()
+
+
+def run_local(args, corpus: np.ndarray, queries: np.ndarray, truth: dict):
+    for nlist, space_type, encoding in itertools.product(args.nlist, args.space_type, args.encoding):
+        # fp16 은 저장 정밀도 손실만 재현 (검색은 float32)
+        vectors = corpus.astype(np.float16).astype(np.float32) if encoding == 'fp16' else corpus
+
+        start = time.perf_counter()
+        index = LocalVectorIndex(dim=corpus.shape[1], space_type=space_type)
+        index.add([str(i) for i in range(len(vectors))], vectors)
+        index.train_ivf(nlist=nlist)
+        build_seconds = time.perf_counter() - start
+
+        itemsize = 2 if encoding == 'fp16' else 4
+        size_bytes = (len(vectors) + nlist) * corpus.shape[1] * itemsize
+
+        for nprobe in args.nprobe:
+            index.nprobe = nprobe
+            pred, latencies = [], []
+            for query in queries:
+                start = time.perf_counter()
+                hits = index.vector_search(query, k=args.k)
+                latencies.append((time.perf_counter() - start) * 1000)
+                pred.append([int(hit['_id']) for hit in hits])
+
+            params = f'nlist={nlist} nprobe={nprobe} {space_type} {encoding}'
+            report(params, truth[space_type], pred, latencies, size_bytes, build_seconds)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--vectors', required=True, help='(N, dim) .npy file or EmbeddingStore directory')
+    parser.add_argument('--queries', type=int, default=200, help='number of vectors held out as queries')
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--space-type', nargs='+', default=['l2'], choices=LocalVectorIndex.SPACE_TYPES)
+    parser.add_argument('--encoding', nargs='+', default=['fp32'], choices=['fp32', 'fp16'])
+
+    # OpenSearch
+    parser.add_argument('--endpoint', default='http://localhost:9200')
+    parser.add_argument('--aws', action='store_true', help='use SigV4 auth for an Amazon OpenSearch domain')
+    parser.add_argument('--region', default='us-west-2')
+    parser.add_argument('--index-prefix', default='hnsw-tuning')
+    parser.add_argument('--engine', default='faiss')
+    parser.add_argument('--m', type=int, nargs='+', default=[16])
+    parser.add_argument('--ef-construction', type=int, nargs='+', default=[512])
+    parser.add_argument('--ef-search', type=int, nargs='+', default=[512])
+    parser.add_argument('--chunk-size', type=int, default=500)
+    parser.add_argument('--max-workers', type=int, default=4)
+    parser.add_argument('--keep', action='store_true', help='keep the tuning indexes')
+
+    # in-process stand-in
+    parser.add_argument('--local', action='store_true', help='use LocalVectorIndex (IVF) instead of OpenSearch')
+    parser.add_argument('--nlist', type=int, nargs='+', default=[256])
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[8])
+    args = parser.parse_args()
+
+    vectors = load_vectors(args.vectors)
+    rng = np.random.default_rng(0)
+    held_out = rng.choice(len(vectors), size=min(args.queries, len(vectors) // 10), replace=False)
+    queries = vectors[held_out]
+    corpus = np.delete(vectors, held_out, axis=0)
+    truth = {space_type: exact_top_k(corpus, queries, args.k, space_type) for space_type in args.space_type}
+    print(f'corpus {corpus.shape}, queries {len(queries)}, k={args.k}')
+
+    print(f'{"params":<48} {"recall@" + str(args.k):>9} {"p50 ms":>8} {"p99 ms":>8} {"size (MB)":>10} {"build (s)":>9}')
+    if args.local:
+        run_local(args, corpus, queries, truth)
+    else:
+        run_opensearch(args, corpus, queries, truth)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+import json
+import re
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class BedrockStubHandler(BaseHTTPRequestHandler):
+    '''
+    bedrock-runtime 의 invoke_model / converse 응답을 흉내내는 local stub
+    응답 전 `latency` 초 만큼 대기하여 실제 모델 호출 지연을 재현합니다.
+    '''
+    latency = 0.2
+    protocol_version = 'HTTP/1.1'
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        self.rfile.read(length)
+        time.sleep(self.latency)
+
+        if re.match(r'^/model/.+/converse$', self.path):
+            body = {
+                'output': {'message': {'role': 'assistant', 'content': [{'text': 'stub'}]}},
+                'stopReason': 'end_turn',
+                'usage': {'inputTokens': 10, 'outputTokens': 1, 'totalTokens': 11},
+                'metrics': {'latencyMs': int(self.latency * 1000)},
+            }
+        elif re.match(r'^/model/.+/invoke$', self.path):
+            body = {
+                'id': 'stub',
+                'type': 'message',
+                'role': 'assistant',
+                'content': [{'type': 'text', 'text': 'stub'}],
+                'model': 'stub',
+                'stop_reason': 'end_turn',
+                'stop_sequence': None,
+                'usage': {'input_tokens': 10, 'output_tokens': 1},
+                'embedding': [0.0] * 8,
+            }
+        else:
+            self.send_error(404)
+            return
+
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(latency: float = 0.2, port: int = 0):
+    '''
+    Returns:
+        (ThreadingHTTPServer, str): server, endpoint url
+    '''
+    handler = type('Handler', (BedrockStubHandler,), {'latency': latency})
+    server = ThreadingHTTPServer(('127.0.0.1', port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
@@ -1,9 +1,10 @@
-import boto3
 import json
 import pandas as pd
 from enum import Enum
 from io import BytesIO
 from PIL import Image
+from genai_kit.aws.client import get_client
+from genai_kit.aws.s3 import S3ObjectCache
 from genai_kit.utils.images import display_image, encode_image_base64
 
 
@@ -12,8 +13,13 @@ class LanguageTag(Enum):
     KOR = 'ko_KR'
 
 
+# Amazon Berkeley Objects 는 변하지 않는 공개 dataset 이므로 하루 동안은 재검증 없이 local cache 사용
+ABO_BUCKET = "amazon-berkeley-objects"
+ABO_CACHE_MAX_AGE = 24 * 3600
+
+
 class DataLoader():
-    def __init__(self, index=0, language=LanguageTag.ENG):
+    def __init__(self, index=0, language=LanguageTag.ENG, cache=None):
         if index < 0 or index > 9:
             raise ValueError("Index must be between 0 and 9.")
         
@@ -23,7 +29,8 @@ class DataLoader():
         self.image_meta = self._get_image_meta()
         self.item_meta = self._get_item_meta()
         self.dataset = self._make_dataset_with_image()
-        self.s3_client = boto3.client('s3')
+        self.s3_client = get_client('s3')
+        self.cache = cache or S3ObjectCache(max_age=ABO_CACHE_MAX_AGE)
 
     def show_item(self, item_id, detail=False) -> dict:
         item, img = self.get_item(item_id=item_id)
@@ -58,11 +65,7 @@ class DataLoader():
             
             if not row.empty:
                 row = row.iloc[0]
-                response = self.s3_client.get_object(
-                    Bucket="amazon-berkeley-objects",
-                    Key=f"images/original/{row['path']}"
-                )
-                image_content = response['Body'].read()
+                image_content = self.cache.get(ABO_BUCKET, f"images/original/{row['path']}")
                 return Image.open(BytesIO(image_content))
         except Exception as e:
             print(e)
@@ -74,11 +77,7 @@ class DataLoader():
             
             if not row.empty:
                 row = row.iloc[0]
-                response = self.s3_client.get_object(
-                    Bucket="amazon-berkeley-objects",
-                    Key=f"images/small/{row['path']}"
-                )
-                image_content = response['Body'].read()
+                image_content = self.cache.get(ABO_BUCKET, f"images/small/{row['path']}")
                 image = Image.open(BytesIO(image_content))
                 
                 return {
@@ -0,0 +1,200 @@
+import os
+import time
+import pickle
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+
+def make_cache_key(*parts) -> str:
+    '''
+    (modelId, inference config, system, text, image bytes ...) 등 임의의 값으로부터
+    content-addressed key(sha256 hex)를 생성합니다.
+    dict 는 key 순서와 무관하게, bytes 는 그대로 hash 합니다.
+    '''
+    h = hashlib.sha256()
+    for part in parts:
+        _update_hash(h, part)
+    return h.hexdigest()
+
+
+def _update_hash(h, obj):
+    if obj is None:
+        h.update(b'N')
+    elif isinstance(obj, (bytes, bytearray, memoryview)):
+        data = bytes(obj)
+        h.update(b'B%d:' % len(data))
+        h.update(data)
+    elif isinstance(obj, str):
+        data = obj.encode('utf-8')
+        h.update(b'S%d:' % len(data))
+        h.update(data)
+    elif isinstance(obj, dict):
+        h.update(b'D%d:' % len(obj))
+        for k in sorted(obj, key=str):
+            _update_hash(h, str(k))
+            _update_hash(h, obj[k])
+    elif isinstance(obj, (list, tuple)):
+        h.update(b'L%d:' % len(obj))
+        for item in obj:
+            _update_hash(h, item)
+    else:
+        data = repr(obj).encode('utf-8')
+        h.update(b'V%d:' % len(data))
+        h.update(data)
+
+
+class MemoryCache():
+    '''
+    In-memory LRU cache
+
+    Args:
+        max_items (int): 최대 항목 수
+        max_bytes (int): 최대 크기 (pickle 기준, None 이면 제한 없음)
+        ttl (float): 만료 시간(초), None 이면 만료되지 않음
+    '''
+    def __init__(self, max_items: int = 1024, max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.max_items = max_items
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.size = 0
+        self._items = OrderedDict()  # key -> (value, size, expires_at)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = item
+            if expires_at is not None and expires_at < time.time():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: str, value: Any):
+        size = len(pickle.dumps(value)) if self.max_bytes else 0
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+            self._items[key] = (value, size, expires_at)
+            self.size += size
+            self._evict()
+
+    def delete(self, key: str):
+        with self._lock:
+            if key in self._items:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.size = 0
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses, 'items': len(self._items), 'bytes': self.size}
+
+    def _remove(self, key: str):
+        _, size, _ = self._items.pop(key)
+        self.size -= size
+
+    def _evict(self):
+        while len(self._items) > self.max_items or (self.max_bytes and self.size > self.max_bytes and len(self._items) > 1):
+            key = next(iter(self._items))
+            self._remove(key)
+
+
+class SQLiteCache():
+    '''
+    On-disk cache (SQLite). process 재시작 후에도 유지되며, 여러 process 에서 공유할 수 있습니다.
+
+    Args:
+        path (str): SQLite 파일 경로
+        max_bytes (int): 최대 크기, 초과 시 오래 사용되지 않은 항목부터 제거
+        ttl (float): 만료 시간(초), None 이면 만료되지 않음
+    '''
+    def __init__(self, path: str = '.genai_kit_cache.sqlite', max_bytes: Optional[int] = None, ttl: Optional[float] = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value BLOB, size INTEGER, created_at REAL, accessed_at REAL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS cache_accessed_at ON cache (accessed_at)')
+        self._conn.commit()
+
+    def get(self, key: str) -> Any:
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute('SELECT value, created_at FROM cache WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            value, created_at = row
+            if self.ttl is not None and created_at + self.ttl < now:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            self._conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+        return pickle.loads(value)
+
+    def set(self, key: str, value: Any):
+        data = pickle.dumps(value)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)',
+                (key, data, len(data), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def delete(self, key: str):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache')
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            items, size = self._conn.execute('SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache').fetchone()
+        return {'hits': self.hits, 'misses': self.misses, 'items': items, 'bytes': size}
+
+    def _evict(self):
+        if self.ttl is not None:
+            self._conn.execute('DELETE FROM cache WHERE created_at < ?', (time.time() - self.ttl,))
+        if not self.max_bytes:
+            return
+        total = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM cache').fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._conn.execute('SELECT key, size FROM cache ORDER BY accessed_at').fetchall():
+            self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
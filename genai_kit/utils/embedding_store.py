@@ -0,0 +1,153 @@
+import os
+import json
+import threading
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+class EmbeddingStore():
+    '''
+    content hash 를 key 로 하는 persistent embedding 저장소
+
+    vector 는 append-only 파일(vectors.bin)에 고정 길이 row 로 저장하고 memory-map 으로 읽으므로
+    수백만 개의 vector 도 즉시 열리며, 조회 시 복사 없이 view 를 반환합니다.
+    hash -> row index 는 keys.txt 에 한 줄씩 append 됩니다 (line 번호 = row 번호).
+
+    하나의 process 에서만 쓰기를 가정합니다. (읽기는 여러 process 에서 가능)
+
+        store = EmbeddingStore('./embeddings', dim=1024, dtype='float16')
+        store.put(key, vector)
+        store.get(key)  # np.ndarray view or None
+    '''
+    VECTORS_FILE = 'vectors.bin'
+    KEYS_FILE = 'keys.txt'
+    META_FILE = 'meta.json'
+
+    def __init__(self, path: str, dim: Optional[int] = None, dtype: str = 'float32'):
+        self.path = path
+        self.dim = dim
+        self.dtype = np.dtype(dtype)
+        self._index: Dict[str, int] = {}
+        self._mmap = None
+        self._lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+        meta_path = os.path.join(path, self.META_FILE)
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            if dim is not None and dim != meta['dim']:
+                raise ValueError(f"Dimension mismatch: store has {meta['dim']}, got {dim}")
+            self.dim = meta['dim']
+            self.dtype = np.dtype(meta['dtype'])
+
+        self._load()
+
+    def __len__(self):
+        return len(self._index)
+
+    def __contains__(self, key: str):
+        return key in self._index
+
+    @property
+    def vectors(self) -> np.ndarray:
+        '''
+        전체 vector 의 memory-mapped (N, dim) 행렬
+        '''
+        return self._get_mmap()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        row = self._index.get(key)
+        if row is None:
+            return None
+        return self._get_mmap()[row]
+
+    def get_many(self, keys: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        Returns:
+            (np.ndarray, np.ndarray): (N, dim) 행렬 (없는 key 는 0), 찾은 key 의 mask (N,)
+        '''
+        rows = [self._index.get(key, -1) for key in keys]
+        rows = np.array(rows, dtype=np.int64)
+        found = rows >= 0
+        matrix = np.zeros((len(rows), self.dim or 0), dtype=self.dtype)
+        if found.any():
+            matrix[found] = self._get_mmap()[rows[found]]
+        return matrix, found
+
+    def put(self, key: str, vector):
+        self.put_many([key], [vector])
+
+    def put_many(self, keys: List[str], vectors):
+        vectors = np.asarray(vectors, dtype=self.dtype)
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+
+        with self._lock:
+            if self.dim is None:
+                self.dim = vectors.shape[1]
+            if vectors.shape[1] != self.dim:
+                raise ValueError(f"Dimension mismatch: store has {self.dim}, got {vectors.shape[1]}")
+            self._write_meta()
+
+            new_keys, new_rows, seen = [], [], set()
+            for key, vector in zip(keys, vectors):
+                if key in self._index or key in seen:
+                    continue
+                seen.add(key)
+                new_keys.append(key)
+                new_rows.append(vector)
+            if not new_keys:
+                return
+
+            # vector 를 먼저 기록한 뒤 key 를 기록하여, 중단되어도 key 가 없는 vector 만 남도록 함
+            with open(self._file(self.VECTORS_FILE), 'ab') as f:
+                f.write(np.ascontiguousarray(new_rows, dtype=self.dtype).tobytes())
+            with open(self._file(self.KEYS_FILE), 'a') as f:
+                f.write(''.join(f'{key}\n' for key in new_keys))
+
+            # 파일 기록 이후에 index 를 갱신해야 reader 가 아직 쓰이지 않은 row 를 보지 않음
+            offset = len(self._index)
+            for i, key in enumerate(new_keys):
+                self._index[key] = offset + i
+
+    def _load(self):
+        keys_path = self._file(self.KEYS_FILE)
+        if not os.path.exists(keys_path) or self.dim is None:
+            return
+
+        with open(keys_path, 'r') as f:
+            keys = f.read().splitlines()
+
+        row_bytes = self.dim * self.dtype.itemsize
+        vectors_path = self._file(self.VECTORS_FILE)
+        size = os.path.getsize(vectors_path) if os.path.exists(vectors_path) else 0
+        rows = min(len(keys), size // row_bytes)
+
+        # 비정상 종료로 짝이 맞지 않는 꼬리 부분 정리
+        if size != rows * row_bytes:
+            with open(vectors_path, 'r+b') as f:
+                f.truncate(rows * row_bytes)
+        if len(keys) != rows:
+            keys = keys[:rows]
+            with open(keys_path, 'w') as f:
+                f.write(''.join(f'{key}\n' for key in keys))
+
+        self._index = {key: row for row, key in enumerate(keys)}
+
+    def _get_mmap(self):
+        rows = len(self._index)
+        if rows == 0:
+            return np.zeros((0, self.dim or 0), dtype=self.dtype)
+        if self._mmap is None or self._mmap.shape[0] < rows:
+            self._mmap = np.memmap(self._file(self.VECTORS_FILE), dtype=self.dtype, mode='r', shape=(rows, self.dim))
+        return self._mmap
+
+    def _write_meta(self):
+        meta_path = self._file(self.META_FILE)
+        if not os.path.exists(meta_path):
+            with open(meta_path, 'w') as f:
+                json.dump({'dim': self.dim, 'dtype': self.dtype.name}, f)
+
+    def _file(self, name: str):
+        return os.path.join(self.path, name)
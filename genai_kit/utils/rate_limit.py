@@ -0,0 +1,88 @@
+import time
+import threading
+from typing import Dict, Optional
+
+
+class TokenBucket():
+    '''
+    분당 허용량(rate_per_minute)만큼 일정한 속도로 채워지는 token bucket.
+    capacity 를 넘는 요청은 bucket 이 가득 찰 때까지 기다린 뒤 음수(debt)로 차감하여
+    큰 요청도 굶지 않고, 이후 요청이 그만큼 늦춰지도록 합니다.
+    '''
+    def __init__(self, rate_per_minute: float, burst_seconds: float = 1.0):
+        self.lock = threading.Lock()
+        self.set_rate(rate_per_minute, burst_seconds)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def set_rate(self, rate_per_minute: float, burst_seconds: float = 1.0):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self, amount: float = 1.0):
+        need = min(amount, self.capacity)
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= need:
+                    self.tokens -= amount
+                    return
+                wait = (need - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def refund(self, amount: float):
+        '''
+        추정치와 실제 사용량의 차이를 보정 (음수이면 추가 차감)
+        '''
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RateLimiter():
+    '''
+    요청 수(rpm)와 토큰 수(tpm)를 함께 제한하는 limiter
+    '''
+    def __init__(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+
+    def update(self, rpm: Optional[int] = None, tpm: Optional[int] = None):
+        if rpm:
+            if self.requests: self.requests.set_rate(rpm)
+            else: self.requests = TokenBucket(rpm)
+        if tpm:
+            if self.tokens: self.tokens.set_rate(tpm)
+            else: self.tokens = TokenBucket(tpm)
+
+    def acquire(self, tokens: int = 0):
+        if self.requests:
+            self.requests.acquire(1)
+        if self.tokens and tokens:
+            self.tokens.acquire(tokens)
+
+    def reconcile(self, estimated: int, actual: int):
+        if self.tokens:
+            self.tokens.refund(estimated - actual)
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(key: str, rpm: Optional[int] = None, tpm: Optional[int] = None) -> RateLimiter:
+    '''
+    key(예: modelId) 별로 process 내에서 공유되는 RateLimiter 를 반환합니다.
+    '''
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = RateLimiter(rpm=rpm, tpm=tpm)
+        else:
+            limiter.update(rpm=rpm, tpm=tpm)
+        return limiter
@@ -0,0 +1,318 @@
+import os
+import json
+import numpy as np
+from typing import Any, Dict, List, Optional
+
+
+class LocalVectorIndex():
+    '''
+    OpenSearchWrapper.vector_search 와 같은 interface 를 제공하는 in-process NumPy vector index
+    개발 환경이나 ~1M 이하의 작은 catalogue 에서 OpenSearch cluster 없이 사용할 수 있습니다.
+
+    - exact top-k: 행렬곱 + argpartition
+    - IVF coarse quantizer (train_ivf): nprobe 개의 cluster 만 탐색
+    - metadata filter: {'metadata.category': 'TABLE', 'product_type': ['CHAIR', 'SOFA'], 'metadata.price': {'lte': 100}}
+    - save / load: .npy
+
+        index = LocalVectorIndex(space_type='cosinesimil')
+        index.update_doc(id, {'vector_field': vector, 'metadata': {...}})
+        index.vector_search(vector, k=5, filter={'metadata.category': 'TABLE'})
+    '''
+    SPACE_TYPES = ('l2', 'cosinesimil', 'innerproduct')
+    RANGE_OPERATORS = {
+        'gt': lambda value, bound: value > bound,
+        'gte': lambda value, bound: value >= bound,
+        'lt': lambda value, bound: value < bound,
+        'lte': lambda value, bound: value <= bound,
+    }
+
+    def __init__(self, dim: Optional[int] = None, space_type: str = 'cosinesimil', vector_field: str = 'vector_field'):
+        if space_type not in self.SPACE_TYPES:
+            raise ValueError(f"space_type must be one of {self.SPACE_TYPES}")
+
+        self.dim = dim
+        self.space_type = space_type
+        self.vector_field = vector_field
+        self.nprobe = 8
+
+        self._vectors = np.zeros((0, dim or 0), dtype=np.float32)
+        self._norms = np.zeros(0, dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._ids: List[str] = []
+        self._sources: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+
+        self._centroids = None
+        self._assignments = np.zeros(0, dtype=np.int32)
+
+        # metadata filter 용 inverted index (field -> value -> rows), 쓰기 시 초기화
+        self._postings: Dict[str, Dict[Any, List[int]]] = {}
+
+    def __len__(self):
+        return len(self._rows)
+
+    '''
+    Update/GET/Delete Document
+    '''
+    def update_doc(self, id: str, body: dict):
+        body = dict(body)
+        vector = body.pop(self.vector_field)
+        self.add([id], [vector], [body])
+
+    def add(self, ids: List[str], vectors, sources: Optional[List[dict]] = None):
+        vectors = self._prepare(np.asarray(vectors, dtype=np.float32).reshape(len(ids), -1))
+        sources = sources or [{} for _ in ids]
+        self._postings = {}
+
+        if self.dim is None:
+            self.dim = vectors.shape[1]
+            self._vectors = np.zeros((0, self.dim), dtype=np.float32)
+        if vectors.shape[1] != self.dim:
+            raise ValueError(f"Dimension mismatch: index has {self.dim}, got {vectors.shape[1]}")
+
+        for id, vector, source in zip(ids, vectors, sources):
+            row = self._rows.get(id)
+            if row is None:
+                row = self._append_row()
+                self._rows[id] = row
+                self._ids.append(id)
+                self._sources.append(source)
+            else:
+                self._sources[row] = source
+            self._vectors[row] = vector
+            self._norms[row] = np.dot(vector, vector)
+            self._alive[row] = True
+            if self._centroids is not None:
+                self._assignments[row] = self._nearest_centroids(vector[None, :], 1)[0, 0]
+
+    def get_doc(self, id: str):
+        row = self._rows.get(id)
+        if row is None:
+            return None
+        return {'_id': id, '_source': self._sources[row]}
+
+    def delete_doc(self, id: str):
+        row = self._rows.pop(id, None)
+        if row is not None:
+            self._alive[row] = False
+            self._postings = {}
+
+    '''
+    Vector Search
+    '''
+    def vector_search(self, vector: List = [], k: int = 3, filter: Optional[dict] = None):
+        '''
+        Returns:
+            list: OpenSearch hits 와 같은 형태의 [{'_id', '_score', '_source'}]
+        '''
+        candidates = self._alive[:self._size].copy()
+        if filter:
+            candidates &= self._filter_mask(filter)
+
+        query = self._prepare(np.asarray(vector, dtype=np.float32).reshape(1, -1))[0]
+        if self._centroids is not None:
+            probe = self._nearest_centroids(query[None, :], self.nprobe)[0]
+            candidates &= np.isin(self._assignments[:self._size], probe)
+
+        rows = np.flatnonzero(candidates)
+        if len(rows) == 0:
+            return []
+
+        scores = self._scores(query, rows)
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [
+            {
+                '_id': self._ids[rows[i]],
+                '_score': float(scores[i]),
+                '_source': self._sources[rows[i]],
+            }
+            for i in top
+        ]
+
+    def train_ivf(self, nlist: int = 256, nprobe: int = 8, iterations: int = 10, sample_size: int = 100000, seed: int = 0):
+        '''
+        k-means 로 coarse quantizer 를 학습합니다. 이후 검색은 query 에서 가까운 nprobe 개의 cluster 만 탐색합니다.
+        '''
+        rows = np.flatnonzero(self._alive[:self._size])
+        if len(rows) < nlist:
+            raise ValueError(f"Need at least {nlist} vectors to train, got {len(rows)}")
+
+        rng = np.random.default_rng(seed)
+        sample = self._vectors[rng.choice(rows, size=min(sample_size, len(rows)), replace=False)]
+        centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            assign = _nearest(sample, centroids, 1)[:, 0]
+            for c in range(nlist):
+                members = sample[assign == c]
+                if len(members):
+                    centroids[c] = members.mean(axis=0)
+
+        self._centroids = centroids
+        self.nprobe = nprobe
+        self._assignments = np.zeros(len(self._vectors), dtype=np.int32)
+        self._assignments[:self._size] = _nearest(self._vectors[:self._size], centroids, 1)[:, 0]
+
+    '''
+    Save / Load
+    '''
+    def save(self, path: str):
+        os.makedirs(path, exist_ok=True)
+        rows = np.flatnonzero(self._alive[:self._size])
+
+        np.save(os.path.join(path, 'vectors.npy'), self._vectors[rows])
+        np.save(os.path.join(path, 'ids.npy'), np.array([self._ids[r] for r in rows], dtype=str))
+        if self._centroids is not None:
+            np.save(os.path.join(path, 'centroids.npy'), self._centroids)
+        with open(os.path.join(path, 'sources.json'), 'w') as f:
+            json.dump([self._sources[r] for r in rows], f, ensure_ascii=False, default=str)
+        with open(os.path.join(path, 'meta.json'), 'w') as f:
+            json.dump({
+                'dim': self.dim,
+                'space_type': self.space_type,
+                'vector_field': self.vector_field,
+                'nprobe': self.nprobe,
+            }, f)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = False):
+        '''
+        mmap=True 이면 vector 를 memory-map 으로 읽습니다. (기존 문서 수정 불가, 추가는 가능)
+        '''
+        with open(os.path.join(path, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+        with open(os.path.join(path, 'sources.json'), 'r') as f:
+            sources = json.load(f)
+
+        index = cls(dim=meta['dim'], space_type=meta['space_type'], vector_field=meta['vector_field'])
+        vectors = np.load(os.path.join(path, 'vectors.npy'), mmap_mode='r' if mmap else None)
+        ids = np.load(os.path.join(path, 'ids.npy')).tolist()
+
+        # 저장된 vector 는 이미 정규화되어 있으므로 그대로 적재
+        index._vectors = vectors if mmap else np.ascontiguousarray(vectors, dtype=np.float32)
+        index._norms = np.einsum('ij,ij->i', vectors, vectors).astype(np.float32)
+        index._alive = np.ones(len(ids), dtype=bool)
+        index._ids = ids
+        index._sources = sources
+        index._rows = {id: row for row, id in enumerate(ids)}
+        index._size = len(ids)
+
+        centroids_path = os.path.join(path, 'centroids.npy')
+        if os.path.exists(centroids_path):
+            index._centroids = np.load(centroids_path)
+            index._assignments = _nearest(np.asarray(vectors), index._centroids, 1)[:, 0].astype(np.int32)
+        index.nprobe = meta.get('nprobe', index.nprobe)
+        return index
+
+    '''
+    Internal
+    '''
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        if self.space_type == 'cosinesimil':
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            vectors = vectors / np.where(norms == 0, 1, norms)
+        return vectors
+
+    def _scores(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        # OpenSearch k-NN 과 같은 score 변환
+        dots = self._vectors[rows] @ query
+        if self.space_type == 'l2':
+            distance = np.maximum(self._norms[rows] - 2 * dots + np.dot(query, query), 0)
+            return 1 / (1 + distance)
+        if self.space_type == 'cosinesimil':
+            return (1 + dots) / 2
+        return np.where(dots >= 0, dots + 1, 1 / (1 - dots))
+
+    def _append_row(self) -> int:
+        if self._size == len(self._vectors):
+            capacity = max(1024, len(self._vectors) * 2)
+            self._vectors = _grow(np.asarray(self._vectors), capacity)
+            self._norms = _grow(self._norms, capacity)
+            self._alive = _grow(self._alive, capacity)
+            self._assignments = _grow(self._assignments, capacity)
+        self._size += 1
+        return self._size - 1
+
+    def _nearest_centroids(self, vectors: np.ndarray, n: int) -> np.ndarray:
+        return _nearest(vectors, self._centroids, n)
+
+    def _filter_mask(self, filter: dict) -> np.ndarray:
+        mask = np.ones(self._size, dtype=bool)
+        for field, expected in filter.items():
+            if isinstance(expected, dict):
+                mask &= self._range_mask(field, expected)
+                continue
+
+            postings = self._get_postings(field)
+            expected = expected if isinstance(expected, (list, tuple, set)) else [expected]
+            field_mask = np.zeros(self._size, dtype=bool)
+            for value in expected:
+                try:
+                    field_mask[postings.get(value, [])] = True
+                except TypeError:
+                    # list / dict 처럼 hash 할 수 없는 값은 어떤 문서와도 일치하지 않음
+                    continue
+            mask &= field_mask
+        return mask
+
+    def _range_mask(self, field: str, bounds: dict) -> np.ndarray:
+        # range 는 posting list 로 찾을 수 없으므로 살아있는 문서의 값을 직접 비교 (OpenSearch range query 와 같은 의미)
+        unknown = set(bounds) - set(self.RANGE_OPERATORS)
+        if unknown:
+            raise ValueError(f"Unsupported range operators: {sorted(unknown)}")
+
+        mask = np.zeros(self._size, dtype=bool)
+        for row in np.flatnonzero(self._alive[:self._size]):
+            value = _get_field(self._sources[row], field)
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            mask[row] = any(_in_range(v, bounds, self.RANGE_OPERATORS) for v in values)
+        return mask
+
+    def _get_postings(self, field: str) -> Dict[Any, List[int]]:
+        postings = self._postings.get(field)
+        if postings is None:
+            postings = {}
+            for row in np.flatnonzero(self._alive[:self._size]):
+                value = _get_field(self._sources[row], field)
+                for v in (value if isinstance(value, (list, tuple, set)) else [value]):
+                    try:
+                        postings.setdefault(v, []).append(row)
+                    except TypeError:
+                        continue
+            self._postings[field] = postings
+        return postings
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, n: int) -> np.ndarray:
+    distance = (centroids * centroids).sum(axis=1)[None, :] - 2 * vectors @ centroids.T
+    n = min(n, len(centroids))
+    top = np.argpartition(distance, n - 1, axis=1)[:, :n]
+    return np.take_along_axis(top, np.argsort(np.take_along_axis(distance, top, axis=1), axis=1), axis=1)
+
+
+def _grow(array: np.ndarray, capacity: int) -> np.ndarray:
+    grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+def _in_range(value, bounds: dict, operators: dict) -> bool:
+    if value is None:
+        return False
+    try:
+        return all(operators[op](value, bound) for op, bound in bounds.items())
+    except TypeError:
+        return False
+
+
+def _get_field(source: dict, field: str):
+    value = source
+    for part in field.split('.'):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(part)
+    return value
@@ -0,0 +1,156 @@
+from decimal import Decimal
+
+import pytest
+from botocore.stub import Stubber
+
+from genai_kit.aws import client as client_registry
+from genai_kit.aws import dynamodb
+from genai_kit.aws.dynamodb import BatchGetError, DynamoDB
+
+TABLE = 'gallery'
+
+
+@pytest.fixture
+def db(monkeypatch):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    monkeypatch.setattr(dynamodb, '_backoff', lambda attempt: 0)
+    client_registry.clear()
+    return DynamoDB(TABLE, region='us-east-1')
+
+
+@pytest.fixture
+def stub(db):
+    with Stubber(db.client) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+
+def put_request(i):
+    return {'PutRequest': {'Item': {'id': f'item-{i}', 'score': Decimal('0.5'), 'tags': ['a', 'b']}}}
+
+
+def wire_put_request(i):
+    # service 응답 (UnprocessedItems) 은 DynamoDB JSON 형식
+    return {'PutRequest': {'Item': {'id': {'S': f'item-{i}'}, 'score': {'N': '0.5'}, 'tags': {'L': [{'S': 'a'}, {'S': 'b'}]}}}}
+
+
+def test_batch_put_splits_into_25_item_requests(db, stub):
+    for chunk in (range(0, 25), range(25, 50), range(50, 60)):
+        stub.add_response('batch_write_item', {}, {'RequestItems': {TABLE: [put_request(i) for i in chunk]}})
+
+    result = db.batch_put([{'id': f'item-{i}', 'score': 0.5, 'tags': ('a', 'b')} for i in range(60)], max_workers=1)
+
+    assert (result['success'], result['failed'], result['errors']) == (60, 0, [])
+
+
+def test_batch_put_keeps_last_item_per_id(db, stub):
+    stub.add_response('batch_write_item', {}, {'RequestItems': {TABLE: [
+        {'PutRequest': {'Item': {'id': 'a', 'n': 2}}},
+        {'PutRequest': {'Item': {'id': 'b', 'n': 1}}},
+    ]}})
+
+    result = db.batch_put([{'id': 'a', 'n': 1}, {'id': 'b', 'n': 1}, {'id': 'a', 'n': 2}], max_workers=1)
+
+    assert result['success'] == 2
+
+
+def test_batch_put_retries_unprocessed_items(db, stub):
+    requests = [put_request(i) for i in range(3)]
+    stub.add_response('batch_write_item', {'UnprocessedItems': {TABLE: [wire_put_request(1), wire_put_request(2)]}},
+                      {'RequestItems': {TABLE: requests}})
+    stub.add_response('batch_write_item', {'UnprocessedItems': {TABLE: [wire_put_request(2)]}},
+                      {'RequestItems': {TABLE: requests[1:]}})
+    stub.add_client_error('batch_write_item', 'ProvisionedThroughputExceededException',
+                          expected_params={'RequestItems': {TABLE: requests[2:]}})
+    stub.add_response('batch_write_item', {}, {'RequestItems': {TABLE: requests[2:]}})
+
+    result = db.batch_put([{'id': f'item-{i}', 'score': 0.5, 'tags': ['a', 'b']} for i in range(3)], max_workers=1)
+
+    assert (result['success'], result['failed']) == (3, 0)
+
+
+def test_batch_write_reports_failures(db, stub):
+    deletes = [{'DeleteRequest': {'Key': {'id': id}}} for id in ('a', 'b')]
+    stub.add_response('batch_write_item',
+                      {'UnprocessedItems': {TABLE: [{'DeleteRequest': {'Key': {'id': {'S': 'b'}}}}]}},
+                      {'RequestItems': {TABLE: deletes}})
+    for _ in range(2):
+        stub.add_response('batch_write_item',
+                          {'UnprocessedItems': {TABLE: [{'DeleteRequest': {'Key': {'id': {'S': 'b'}}}}]}},
+                          {'RequestItems': {TABLE: deletes[1:]}})
+    stub.add_client_error('batch_write_item', 'ValidationException', 'bad key',
+                          expected_params={'RequestItems': {TABLE: [{'DeleteRequest': {'Key': {'id': 'c'}}}]}})
+
+    result = db.batch_delete(['a', 'b', 'a'], max_retries=2, max_workers=1)
+    assert (result['success'], result['failed']) == (1, 1)
+    assert result['errors'] == [('b', 'still unprocessed after 2 retries')]
+
+    result = db.batch_delete(['c'], max_workers=1)
+    assert (result['success'], result['failed']) == (0, 1)
+    assert result['errors'][0][0] == 'c' and 'bad key' in result['errors'][0][1]
+
+
+def test_batch_get_splits_into_100_key_requests(db, stub):
+    ids = [f'item-{i}' for i in range(250)]
+    for start, end in ((0, 100), (100, 200), (200, 250)):
+        stub.add_response(
+            'batch_get_item',
+            {'Responses': {TABLE: [{'id': {'S': id}} for id in ids[start:end]]}},
+            {'RequestItems': {TABLE: {'Keys': [{'id': id} for id in ids[start:end]]}}},
+        )
+
+    assert [item['id'] for item in db.batch_get(ids, max_workers=1)] == ids
+
+
+def test_batch_get_retries_unprocessed_keys_and_keeps_request_order(db, stub):
+    projection = {'ProjectionExpression': '#p0, #p1.#p2', 'ExpressionAttributeNames': {'#p0': 'id', '#p1': 'details', '#p2': 'status'}}
+    stub.add_response(
+        'batch_get_item',
+        {
+            'Responses': {TABLE: [{'id': {'S': 'c'}, 'details': {'M': {'status': {'S': 'Completed'}}}}]},
+            'UnprocessedKeys': {TABLE: {'Keys': [{'id': {'S': 'a'}}]}},
+        },
+        {'RequestItems': {TABLE: {'Keys': [{'id': 'c'}, {'id': 'missing'}, {'id': 'a'}], **projection}}},
+    )
+    stub.add_response(
+        'batch_get_item',
+        {'Responses': {TABLE: [{'id': {'S': 'a'}, 'details': {'M': {'status': {'S': 'InProgress'}}}}]}},
+        {'RequestItems': {TABLE: {'Keys': [{'id': 'a'}], **projection}}},
+    )
+
+    items = db.batch_get(['c', 'missing', 'a', 'c'], projection=['details.status'], max_workers=1)
+
+    assert items == [
+        {'id': 'c', 'details': {'status': 'Completed'}},
+        {'id': 'a', 'details': {'status': 'InProgress'}},
+    ]
+
+
+def test_batch_get_converts_numbers(db, stub):
+    stub.add_response('batch_get_item', {'Responses': {TABLE: [{'id': {'S': 'a'}, 'n': {'N': '2'}, 'f': {'N': '1.5'}}]}})
+
+    assert db.batch_get(['a'], max_workers=1) == [{'id': 'a', 'n': 2.0, 'f': 1.5}]
+
+
+def test_batch_get_reports_failed_keys(db, stub):
+    stub.add_client_error('batch_get_item', 'ResourceNotFoundException', 'no table')
+
+    with pytest.raises(BatchGetError) as info:
+        db.batch_get(['a'], max_workers=1)
+    assert info.value.items == []
+    assert info.value.errors[0][0] == 'a' and 'no table' in info.value.errors[0][1]
+
+
+def test_batch_get_keeps_items_read_before_retries_run_out(db, stub):
+    stub.add_response('batch_get_item', {
+        'Responses': {TABLE: [{'id': {'S': 'a'}}]},
+        'UnprocessedKeys': {TABLE: {'Keys': [{'id': {'S': 'b'}}]}},
+    })
+    stub.add_response('batch_get_item', {'UnprocessedKeys': {TABLE: {'Keys': [{'id': {'S': 'b'}}]}}},
+                      {'RequestItems': {TABLE: {'Keys': [{'id': 'b'}]}}})
+
+    with pytest.raises(BatchGetError) as info:
+        db.batch_get(['a', 'b', 'c'], max_retries=1, max_workers=1)
+    assert info.value.items == [{'id': 'a'}]
+    assert info.value.errors == [('b', 'still unprocessed after 1 retries')]
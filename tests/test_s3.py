@@ -0,0 +1,80 @@
+import hashlib
+import io
+import os
+
+import pytest
+from botocore.response import StreamingBody
+from botocore.stub import Stubber
+
+from genai_kit.aws import client as client_registry
+from genai_kit.aws.s3 import S3ObjectCache
+
+BUCKET = 'dataset'
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setenv('AWS_ACCESS_KEY_ID', 'testing')
+    monkeypatch.setenv('AWS_SECRET_ACCESS_KEY', 'testing')
+    client_registry.clear()
+    return S3ObjectCache(path=str(tmp_path), max_bytes=1000, region='us-east-1')
+
+
+@pytest.fixture
+def stub(cache):
+    with Stubber(cache.storage) as stubber:
+        yield stubber
+        stubber.assert_no_pending_responses()
+
+
+def add_object(stub, key, data: bytes, etag='"v1"'):
+    stub.add_response('get_object', {
+        'Body': StreamingBody(io.BytesIO(data), len(data)),
+        'ETag': etag,
+        'ContentLength': len(data),
+    }, {'Bucket': BUCKET, 'Key': key})
+
+
+def path_of(cache, key):
+    name = hashlib.sha256(f'{BUCKET}/{key}'.encode('utf-8')).hexdigest()
+    return os.path.join(cache.path, name[:2], name)
+
+
+def data_files(cache):
+    return [path for path, _, _ in cache._entries()]
+
+
+def test_object_larger_than_cache_is_returned(cache, stub):
+    cache.max_bytes = 100
+    add_object(stub, 'big', b'x' * 200)
+
+    assert cache.get(BUCKET, 'big') == b'x' * 200
+    # 다음 miss 에서 evict
+    add_object(stub, 'small', b'y' * 10)
+    assert cache.get(BUCKET, 'small') == b'y' * 10
+    assert len(data_files(cache)) == 1
+
+
+def test_evicts_least_recently_used(cache, stub):
+    for i in range(3):
+        add_object(stub, f'k{i}', bytes([i]) * 400)
+        assert cache.get(BUCKET, f'k{i}') == bytes([i]) * 400
+
+    # 가장 최근 object 는 남고, 가장 오래된 object 부터 max_bytes * EVICT_TARGET 이하가 될 때까지 삭제
+    assert os.path.exists(path_of(cache, 'k2'))
+    assert not os.path.exists(path_of(cache, 'k0'))
+    assert cache.stats()['bytes'] <= cache.max_bytes * cache.EVICT_TARGET
+    # evict 된 object 는 lock / metadata 파일도 남지 않음
+    remaining = {os.path.basename(path) for path in data_files(cache)}
+    names = {name.split('.')[0] for _, _, files in os.walk(cache.path) for name in files if not name.startswith('.')}
+    assert names == remaining
+
+
+def test_revalidates_with_etag(cache, stub):
+    add_object(stub, 'k', b'data')
+    stub.add_client_error('get_object', '304', http_status_code=304,
+                          expected_params={'Bucket': BUCKET, 'Key': 'k', 'IfNoneMatch': '"v1"'})
+
+    assert cache.get(BUCKET, 'k') == b'data'
+    assert cache.get(BUCKET, 'k') == b'data'
+    assert (cache.misses, cache.revalidated) == (1, 1)
@@ -0,0 +1,127 @@
+import numpy as np
+import pytest
+
+from genai_kit.utils.vector_index import LocalVectorIndex
+
+
+def make_index(space_type='l2', n=200, dim=16, seed=0):
+    rng = np.random.default_rng(seed)
+    vectors = rng.normal(size=(n, dim)).astype(np.float32)
+    sources = [
+        {
+            'metadata': {'category': ['TABLE', 'CHAIR', 'SOFA'][i % 3], 'price': i},
+            'tags': [f'tag-{i % 5}', f'tag-{i % 7}'],
+            'raw': {'nested': [i]},
+        }
+        for i in range(n)
+    ]
+    index = LocalVectorIndex(space_type=space_type)
+    index.add([str(i) for i in range(n)], vectors, sources)
+    return index, vectors
+
+
+def brute_force(vectors, query, k, space_type):
+    if space_type == 'l2':
+        scores = -((vectors - query) ** 2).sum(axis=1)
+    elif space_type == 'cosinesimil':
+        normed = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        scores = normed @ (query / np.linalg.norm(query))
+    else:
+        scores = vectors @ query
+    return [str(i) for i in np.argsort(-scores)[:k]]
+
+
+@pytest.mark.parametrize('space_type', LocalVectorIndex.SPACE_TYPES)
+def test_exact_top_k_matches_brute_force(space_type):
+    index, vectors = make_index(space_type)
+    query = vectors[3] + 0.1
+
+    hits = index.vector_search(query, k=10)
+
+    assert [hit['_id'] for hit in hits] == brute_force(vectors, query, 10, space_type)
+    scores = [hit['_score'] for hit in hits]
+    assert scores == sorted(scores, reverse=True)
+
+
+def test_ivf_with_all_lists_probed_is_exact():
+    index, vectors = make_index('l2', n=400)
+    query = vectors[10]
+    exact = [hit['_id'] for hit in index.vector_search(query, k=10)]
+
+    index.train_ivf(nlist=8, nprobe=8)
+    assert [hit['_id'] for hit in index.vector_search(query, k=10)] == exact
+
+    index.nprobe = 1
+    assert index.vector_search(query, k=1)[0]['_id'] == '10'
+
+
+def test_term_and_terms_filters():
+    index, vectors = make_index()
+
+    hits = index.vector_search(vectors[0], k=500, filter={'metadata.category': 'CHAIR'})
+    assert hits and all(hit['_source']['metadata']['category'] == 'CHAIR' for hit in hits)
+    assert len(hits) == len([i for i in range(200) if i % 3 == 1])
+
+    hits = index.vector_search(vectors[0], k=500, filter={'metadata.category': ['CHAIR', 'SOFA']})
+    assert len(hits) == len([i for i in range(200) if i % 3 != 0])
+
+    # list 필드는 값 중 하나만 일치하면 됨
+    hits = index.vector_search(vectors[0], k=500, filter={'tags': 'tag-6'})
+    assert {hit['_id'] for hit in hits} == {str(i) for i in range(200) if i % 7 == 6}
+
+
+def test_range_filter():
+    index, vectors = make_index()
+
+    hits = index.vector_search(vectors[0], k=500, filter={'metadata.price': {'lte': 100}})
+    assert {hit['_id'] for hit in hits} == {str(i) for i in range(101)}
+
+    hits = index.vector_search(vectors[0], k=500, filter={'metadata.price': {'gt': 10, 'lt': 20}, 'metadata.category': 'TABLE'})
+    assert {hit['_id'] for hit in hits} == {str(i) for i in range(11, 20) if i % 3 == 0}
+
+    # 값이 없거나 비교할 수 없는 문서는 제외
+    assert index.vector_search(vectors[0], k=5, filter={'metadata.category': {'gte': 1}}) == []
+    assert index.vector_search(vectors[0], k=5, filter={'missing': {'gte': 1}}) == []
+
+    with pytest.raises(ValueError):
+        index.vector_search(vectors[0], k=5, filter={'metadata.price': {'between': 1}})
+
+
+def test_unhashable_values_do_not_crash():
+    index, vectors = make_index()
+
+    assert index.vector_search(vectors[0], k=5, filter={'raw.nested': [[1]]}) == []
+    assert index.vector_search(vectors[0], k=5, filter={'raw': 'x'}) == []
+
+
+def test_update_and_delete():
+    index, vectors = make_index()
+
+    index.update_doc('0', {'vector_field': vectors[0], 'metadata': {'category': 'LAMP'}})
+    assert index.get_doc('0')['_source'] == {'metadata': {'category': 'LAMP'}}
+    assert [hit['_id'] for hit in index.vector_search(vectors[0], k=5, filter={'metadata.category': 'LAMP'})] == ['0']
+
+    index.delete_doc('0')
+    assert index.get_doc('0') is None
+    assert len(index) == 199
+    assert '0' not in [hit['_id'] for hit in index.vector_search(vectors[0], k=5)]
+
+
+@pytest.mark.parametrize('mmap', [False, True])
+def test_save_and_load(tmp_path, mmap):
+    index, vectors = make_index('cosinesimil', n=300)
+    index.train_ivf(nlist=4, nprobe=2)
+    index.delete_doc('5')
+    query = vectors[7]
+    expected = index.vector_search(query, k=10, filter={'metadata.price': {'gte': 50}})
+
+    index.save(str(tmp_path))
+    loaded = LocalVectorIndex.load(str(tmp_path), mmap=mmap)
+
+    assert len(loaded) == 299
+    assert loaded.space_type == 'cosinesimil'
+    assert loaded.nprobe == 2
+    assert loaded.get_doc('5') is None
+    hits = loaded.vector_search(query, k=10, filter={'metadata.price': {'gte': 50}})
+    assert [hit['_id'] for hit in hits] == [hit['_id'] for hit in expected]
+    assert np.allclose([hit['_score'] for hit in hits], [hit['_score'] for hit in expected])